@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-from db.db import query_table
+from db.db import database_errors, query_table
+from db.results_store import get_results_store
 
 # ---------------------------------
 # Tab config
@@ -18,7 +19,39 @@ st.title("View Input Tables")
 table_options = ["BlackScholesInputs", "BinomialInputs", "MonteCarloInputs"]
 table_choice = st.selectbox("Choose table to view:", table_options)
 
+page_size = st.selectbox("Rows per page:", [100, 1000, 10000], index=1)
+page = st.number_input("Page:", min_value=1, value=1, step=1)
+
 # Display Table Contents
-df = query_table(table_choice)
-st.write(f"Table: {table_choice}")
+try:
+    df = query_table(table_choice, page=page - 1, page_size=page_size)
+except database_errors():
+    # The table does not exist until the first run of its model is stored
+    df = pd.DataFrame()
+st.write(f"Table: {table_choice} (page {page})")
 st.dataframe(df)
+
+# ---------------------------------
+# Stored Pricing Runs
+# ---------------------------------
+st.divider()
+st.title("Stored Pricing Runs")
+
+store = get_results_store()
+models = sorted({meta["model"] for _, meta in store.shards()})
+model_choice = st.selectbox("Model:", ["All"] + models)
+model_filter = None if model_choice == "All" else model_choice
+date_range = st.date_input("Priced between:", value=())
+
+start = end = None
+if len(date_range) == 2:
+    start = pd.Timestamp(date_range[0])
+    end = pd.Timestamp(date_range[1]) + pd.Timedelta(days=1) - pd.Timedelta(1, unit="ns")
+
+# Only the rows of the current page are read from the memory-mapped shards
+total_rows = store.count(model_filter, start, end)
+run_page_size = st.selectbox("Runs per page:", [100, 1000, 10000], index=1)
+last_page = max((total_rows - 1) // run_page_size + 1, 1)
+run_page = st.number_input(f"Page (of {last_page}):", min_value=1, max_value=last_page, value=1, step=1)
+st.write(f"{total_rows} rows")
+st.dataframe(store.page((run_page - 1) * run_page_size, run_page_size, model_filter, start, end))
@@ -0,0 +1,241 @@
+"""
+Price a file of contracts without the Streamlit app.
+
+Usage (from the project root):
+    python batch_pricer.py contracts.csv priced.csv
+    python batch_pricer.py contracts.parquet priced.parquet --workers 4 --chunk-size 50000
+
+Input rows need StockPrice, StrikePrice, TimeToExpiry, InterestRate and Volatility
+columns, the same names the app stores. An optional Model column picks
+"Black-Scholes", "Binomial" or "Monte-Carlo" per row (--model sets the default), and
+optional Steps / Simulations columns override --steps / --simulations.
+
+The input is read and written one chunk at a time, so memory is bounded by
+chunk size x (workers + queued chunks) whatever the file size. Each output row carries
+the input columns plus call/put prices, deltas and gamma; Black-Scholes rows also get
+vega, theta and rho (NaN for the other models). Binomial deltas and gamma come from
+the first tree nodes, with Gamma taken from the call since American call and put
+gammas differ. Monte-Carlo ones are central differences in the spot price with common
+random numbers, so the bumps do not add sampling noise. Parquet needs pyarrow.
+"""
+import argparse
+import collections
+import concurrent.futures
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import black_scholes_greeks, black_scholes_prices
+from models.european.MonteCarlo import monte_carlo_prices
+from models.surface import SURFACE_MODELS
+from utils.instrumentation import instrumented
+
+INPUT_COLUMNS = ("StockPrice", "StrikePrice", "TimeToExpiry", "InterestRate", "Volatility")
+GREEK_COLUMNS = {
+    "CallDelta": "call_delta", "PutDelta": "put_delta", "Gamma": "gamma", "Vega": "vega",
+    "CallTheta": "call_theta", "PutTheta": "put_theta", "CallRho": "call_rho", "PutRho": "put_rho",
+}
+OUTPUT_COLUMNS = ("Model", "CallPrice", "PutPrice", *GREEK_COLUMNS)
+# Relative spot bump for the finite-difference Monte-Carlo Greeks
+SPOT_BUMP = 0.01
+
+def _file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"unsupported file type {extension!r}, expected .csv or .parquet")
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet input and output need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+def read_chunks(path, chunk_size):
+    """
+    Yield the contracts in path as DataFrames of at most chunk_size rows.
+    """
+    if _file_format(path) == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+    pyarrow = _require_pyarrow()
+    for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+class ChunkWriter:
+    def __init__(self, path):
+        """
+        Initialize a writer that appends priced chunks to a CSV or Parquet file.
+
+        Parameters:
+        path (str): Output file, replaced if it exists
+        """
+        self.path = path
+        self.format = _file_format(path)
+        self._parquet_writer = None
+        self._started = False
+        if self.format == "parquet":
+            _require_pyarrow()
+
+    def write(self, df):
+        if self.format == "csv":
+            df.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        else:
+            import pyarrow
+
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        self._started = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+def _bumped_greeks(price, S):
+    """
+    Central-difference deltas and gamma of a (call, put) pricer in the spot price.
+
+    Parameters:
+    price (callable): Maps spot prices to (call_prices, put_prices)
+    S (np.ndarray): Spot prices
+
+    Returns:
+    tuple: ((call_prices, put_prices), greeks dict)
+    """
+    h = SPOT_BUMP * S
+    # One evaluation over the stacked (down, mid, up) spots
+    calls, puts = price(np.concatenate([S - h, S, S + h]))
+    (call_down, call_mid, call_up), (put_down, put_mid, put_up) = np.split(calls, 3), np.split(puts, 3)
+    greeks = {
+        "call_delta": (call_up - call_down) / (2 * h),
+        "put_delta": (put_up - put_down) / (2 * h),
+        "gamma": (call_up - 2 * call_mid + call_down) / h**2,
+    }
+    return (call_mid, put_mid), greeks
+
+@instrumented()
+def price_chunk(df, model="Black-Scholes", steps=100, simulations=10000, seed=0):
+    """
+    Price one chunk of contracts, routing every row to its model.
+
+    Parameters:
+    df (pd.DataFrame): Contracts with the INPUT_COLUMNS and optional Model, Steps and Simulations
+    model (str): Model for rows without a Model value
+    steps (int): Binomial tree steps for rows without a Steps value
+    simulations (int): Monte-Carlo paths for rows without a Simulations value
+    seed (int): Seed for the Monte-Carlo draws, shared by every row
+
+    Returns:
+    pd.DataFrame: The input columns followed by the OUTPUT_COLUMNS
+    """
+    missing = [column for column in INPUT_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"input is missing required columns: {', '.join(missing)}")
+    S, K, T, r, sigma = (df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS)
+    models = df["Model"].fillna(model).to_numpy(dtype=object) if "Model" in df.columns else np.full(len(df), model, dtype=object)
+    unknown = set(models) - set(SURFACE_MODELS)
+    if unknown:
+        raise ValueError(f"Model must be one of {SURFACE_MODELS}, got {sorted(unknown)}")
+
+    out = df.copy()
+    out["Model"] = models
+    call_prices, put_prices = np.full(len(df), np.nan), np.full(len(df), np.nan)
+    greek_values = {key: np.full(len(df), np.nan) for key in GREEK_COLUMNS.values()}
+
+    rows = models == "Black-Scholes"
+    if rows.any():
+        call_prices[rows], put_prices[rows] = black_scholes_prices(S[rows], K[rows], T[rows], r[rows], sigma[rows])
+        for key, values in black_scholes_greeks(S[rows], K[rows], T[rows], r[rows], sigma[rows]).items():
+            greek_values[key][rows] = values
+
+    rows = np.flatnonzero(models == "Binomial")
+    if len(rows):
+        N = df["Steps"].fillna(steps).to_numpy()[rows] if "Steps" in df.columns else steps
+        args = (S[rows], K[rows], T[rows], r[rows], sigma[rows], N)
+        call_prices[rows], greek_values["call_delta"][rows], greek_values["gamma"][rows] = binomial_american_batch(*args, 'call', greeks=True)
+        put_prices[rows], greek_values["put_delta"][rows], _ = binomial_american_batch(*args, 'put', greeks=True)
+
+    paths = df["Simulations"].fillna(simulations).to_numpy() if "Simulations" in df.columns else np.full(len(df), simulations)
+    for n in np.unique(paths[models == "Monte-Carlo"]):
+        rows = np.flatnonzero((models == "Monte-Carlo") & (paths == n))
+        args = [np.tile(a[rows], 3) for a in (K, T, r, sigma)]
+        price = lambda spots: monte_carlo_prices(spots, *args, int(n), seed)
+        (call_prices[rows], put_prices[rows]), greeks = _bumped_greeks(price, S[rows])
+        for key, values in greeks.items():
+            greek_values[key][rows] = values
+
+    out["CallPrice"], out["PutPrice"] = call_prices, put_prices
+    for column, key in GREEK_COLUMNS.items():
+        out[column] = greek_values[key]
+    return out
+
+def run(input_path, output_path, chunk_size=10000, workers=0, **pricing_options):
+    """
+    Stream input_path through price_chunk into output_path.
+
+    With workers > 0 chunks are priced in a process pool; at most two chunks per worker
+    are in flight and results are written in input order.
+
+    Returns:
+    tuple: (rows priced, seconds taken)
+    """
+    start = time.perf_counter()
+    writer = ChunkWriter(output_path)
+    rows = 0
+    try:
+        if workers <= 0:
+            for chunk in read_chunks(input_path, chunk_size):
+                priced = price_chunk(chunk, **pricing_options)
+                writer.write(priced)
+                rows += len(priced)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = collections.deque()
+                for chunk in read_chunks(input_path, chunk_size):
+                    pending.append(pool.submit(price_chunk, chunk, **pricing_options))
+                    if len(pending) >= 2 * workers:
+                        priced = pending.popleft().result()
+                        writer.write(priced)
+                        rows += len(priced)
+                while pending:
+                    priced = pending.popleft().result()
+                    writer.write(priced)
+                    rows += len(priced)
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="contracts to price (.csv or .parquet)")
+    parser.add_argument("output", help="where to write the priced contracts (.csv or .parquet)")
+    parser.add_argument("--model", choices=SURFACE_MODELS, default="Black-Scholes", help="model for rows without a Model column value")
+    parser.add_argument("--steps", type=int, default=100, help="Binomial tree steps (default 100)")
+    parser.add_argument("--simulations", type=int, default=10000, help="Monte-Carlo paths (default 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the Monte-Carlo draws")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows read, priced and written at a time")
+    parser.add_argument("--workers", type=int, default=0, help="price chunks in this many processes (default: in-process)")
+    args = parser.parse_args(argv)
+    for path in (args.input, args.output):
+        try:
+            _file_format(path)
+        except ValueError as e:
+            parser.error(str(e))
+
+    rows, seconds = run(args.input, args.output, chunk_size=args.chunk_size, workers=args.workers,
+                        model=args.model, steps=args.steps, simulations=args.simulations, seed=args.seed)
+    print(f"Priced {rows} rows in {seconds:.2f} s ({rows / max(seconds, 1e-9):,.0f} rows/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Benchmark every pricing model across a grid of problem sizes and track regressions.
+
+Usage (from the project root):
+    python -m benchmarks.bench_models --save benchmarks/baseline.json
+    python -m benchmarks.bench_models --compare benchmarks/baseline.json --threshold 0.2
+
+Each case records its best wall time, throughput (items per second), peak traced
+memory and absolute error against a reference price. --compare exits with status 1
+when any case's throughput falls more than --threshold below the baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.stats import norm
+
+from models.american.Binomial import BinomialAmericanOption, binomial_american_batch, get_lattice, lattice_price
+from models.american.LongstaffSchwartz import LongstaffSchwartzAmericanOption
+from models.european.BlackScholes import black_scholes_prices
+from models.european.ImpliedVolatility import implied_volatility
+from models.european.MonteCarlo import MonteCarlo
+
+S, K, T, r, sigma = 100.0, 100.0, 1.0, 0.05, 0.2
+
+def _measure(run, items, repeat):
+    """
+    Time run() repeat times and trace the peak memory of one extra call.
+
+    The lattice cache is cleared before every call, so tree cases pay for building
+    their lattice each time instead of timing a warm cache hit after the first call.
+
+    Returns:
+    tuple: (best_seconds, throughput, peak_mb, result of the traced call)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        get_lattice.cache_clear()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    get_lattice.cache_clear()
+    tracemalloc.start()
+    result = run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, items / best, peak / 2**20, result
+
+def _cases(quick):
+    """
+    Build the benchmark cases as (name, run, items, error_of_result) tuples.
+    """
+    european_put = black_scholes_prices(S, K, T, r, sigma)[1]
+    american_put = lattice_price(S, K, T, r, sigma, 10001, 'put', 'leisen-reimer')
+
+    chain_lengths = (1_000, 100_000) if quick else (1_000, 100_000, 1_000_000)
+    tree_steps = (100, 1_000) if quick else (100, 1_000, 5_000)
+    path_counts = (10_000, 100_000) if quick else (10_000, 100_000, 1_000_000)
+
+    cases = []
+    for n in chain_lengths:
+        strikes = np.linspace(50, 150, n)
+        quotes = black_scholes_prices(S, strikes, T, r, sigma)[0]
+        # Textbook formula with scipy.stats.norm as the reference
+        d1 = (np.log(S / strikes) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+        reference = S * norm.cdf(d1) - strikes * np.exp(-r * T) * norm.cdf(d1 - sigma * np.sqrt(T))
+        cases.append((f"black_scholes_chain[{n}]",
+                      lambda strikes=strikes: black_scholes_prices(S, strikes, T, r, sigma), n,
+                      lambda result, reference=reference: float(np.max(np.abs(result[0] - reference)))))
+        cases.append((f"implied_volatility[{n}]",
+                      lambda quotes=quotes, strikes=strikes: implied_volatility(quotes, S, strikes, T, r), n,
+                      lambda result: float(np.nanmax(np.abs(result - sigma)))))
+    for N in tree_steps:
+        cases.append((f"binomial_put[N={N}]",
+                      lambda N=N: BinomialAmericanOption(S, K, T, r, sigma, N).put_price(), 1,
+                      lambda result: abs(result - american_put)))
+        cases.append((f"leisen_reimer_put[N={N}]",
+                      lambda N=N: lattice_price(S, K, T, r, sigma, N, 'put', 'leisen-reimer'), 1,
+                      lambda result: abs(result - american_put)))
+    book = 1_000 if quick else 10_000
+    strikes = np.linspace(80, 120, book)
+    cases.append((f"binomial_batch_put[{book}x100]",
+                  lambda: binomial_american_batch(S, strikes, T, r, sigma, 100, 'put'), book,
+                  lambda result: abs(result[0] - BinomialAmericanOption(S, strikes[0], T, r, sigma, 100).put_price())))
+    for n in path_counts:
+        for method in (None, 'antithetic', 'sobol'):
+            cases.append((f"monte_carlo[{method or 'plain'},{n}]",
+                          lambda n=n, method=method: MonteCarlo(S, K, T, r, sigma, n, method, seed=0).prices_with_error(), n,
+                          lambda result: abs(result[1][0] - european_put)))
+    paths = 20_000 if quick else 100_000
+    cases.append((f"longstaff_schwartz_put[{paths}x50]",
+                  lambda: LongstaffSchwartzAmericanOption(S, K, T, r, sigma, 50, paths=paths, seed=0).price_with_error('put'), paths,
+                  lambda result: abs(result[0] - american_put)))
+    return cases
+
+def run_benchmarks(quick=False, repeat=3, only=None):
+    """
+    Run every benchmark case (optionally only those whose name contains only).
+
+    Returns:
+    dict: Report with environment metadata and one entry per case
+    """
+    results = {}
+    for name, run, items, error in _cases(quick):
+        if only and only not in name:
+            continue
+        seconds, throughput, peak_mb, result = _measure(run, items, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "throughput": throughput,
+            "peak_mb": peak_mb,
+            "error": float(error(result)),
+        }
+        print(f"{name:<40} {seconds * 1e3:10.3f} ms {throughput:14.1f}/s {peak_mb:9.2f} MB  err={results[name]['error']:.2e}")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, threshold):
+    """
+    List the cases whose throughput regressed more than threshold against the baseline.
+
+    Returns:
+    list: (name, baseline_throughput, current_throughput) for every regression
+    """
+    regressions = []
+    for name, previous in baseline["results"].items():
+        current = report["results"].get(name)
+        if current is None:
+            continue
+        if current["throughput"] < previous["throughput"] * (1 - threshold):
+            regressions.append((name, previous["throughput"], current["throughput"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative throughput drop (default 0.2)")
+    parser.add_argument("--quick", action="store_true", help="run the smaller problem sizes only")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repetitions per case (best is kept)")
+    parser.add_argument("--only", help="run only the cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(quick=args.quick, repeat=args.repeat, only=args.only)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.1f}/s -> {after:.1f}/s ({after / before - 1:+.1%})")
+        if regressions:
+            return 1
+        print(f"No throughput regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
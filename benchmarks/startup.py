@@ -0,0 +1,142 @@
+"""
+Measure cold import time of the models package and the Streamlit entry point.
+
+Usage (from the project root):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --save benchmarks/startup_baseline.json
+    python -m benchmarks.startup --compare benchmarks/startup_baseline.json --threshold 0.2
+
+Every case imports its modules in a fresh interpreter, so nothing is shared between
+runs. Besides the best wall time, each case lists the heavy libraries (SciPy, pandas,
+matplotlib, seaborn) that ended up loaded. The reference cases time those libraries
+on their own, which is the cost a module pays if it imports them eagerly. --compare
+exits with status 1 when any case got more than --threshold slower than the baseline.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("scipy", "pandas", "matplotlib", "seaborn")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def _entry_point_imports(path):
+    """
+    Top-level modules imported by a script, in the order it imports them.
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+def _cases():
+    """
+    Build the benchmark cases as (name, modules to import) tuples.
+    """
+    return [
+        ("reference: numpy", ["numpy"]),
+        ("reference: scipy.stats", ["scipy.stats"]),
+        ("reference: matplotlib.pyplot + seaborn", ["matplotlib.pyplot", "seaborn"]),
+        ("models.european.BlackScholes", ["models.european.BlackScholes"]),
+        ("models (all pricing modules)", [
+            "models.american.Binomial", "models.american.LongstaffSchwartz",
+            "models.european.BlackScholes", "models.european.ImpliedVolatility",
+            "models.european.MonteCarlo", "models.cache", "models.strategy", "models.surface",
+        ]),
+        ("matplot (rendering modules)", ["matplot.heatmap_plotting", "matplot.payoff_plotting"]),
+        ("main.py imports", _entry_point_imports(os.path.join(ROOT, "main.py"))),
+    ]
+
+def _measure(modules, repeat):
+    """
+    Import modules in repeat fresh interpreters.
+
+    Returns:
+    tuple: (best_seconds, heavy modules loaded)
+    """
+    best, loaded = float("inf"), []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _PROBE.format(modules=modules, heavy=HEAVY_MODULES)],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        best, loaded = min(best, probe["seconds"]), probe["loaded"]
+    return best, loaded
+
+def run_benchmarks(repeat=5):
+    """
+    Time every startup case.
+
+    Returns:
+    dict: Report with environment metadata and one entry per case
+    """
+    results = {}
+    for name, modules in _cases():
+        seconds, loaded = _measure(modules, repeat)
+        results[name] = {"seconds": seconds, "loaded": loaded}
+        print(f"{name:<40} {seconds * 1e3:10.1f} ms  loads: {', '.join(loaded) or '-'}")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, threshold):
+    """
+    List the cases whose import time grew more than threshold against the baseline.
+
+    Returns:
+    list: (name, baseline_seconds, current_seconds) for every regression
+    """
+    regressions = []
+    for name, previous in baseline["results"].items():
+        current = report["results"].get(name)
+        if current is None or name.startswith("reference"):
+            continue
+        if current["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append((name, previous["seconds"], current["seconds"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown (default 0.2)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per case (best is kept)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(repeat=args.repeat)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1e3:.1f} ms -> {after * 1e3:.1f} ms ({after / before - 1:+.1%})")
+        if regressions:
+            return 1
+        print(f"No startup regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
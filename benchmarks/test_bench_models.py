@@ -0,0 +1,17 @@
+from benchmarks.bench_models import S, K, T, r, sigma, _measure, compare
+from models.american.Binomial import BinomialAmericanOption, get_lattice
+
+def test_every_repeat_builds_its_lattice():
+    cached_before_call = []
+
+    def run():
+        cached_before_call.append(get_lattice.cache_info().currsize)
+        return BinomialAmericanOption(S, K, T, r, sigma, 50).put_price()
+
+    _measure(run, 1, repeat=3)
+    assert cached_before_call == [0, 0, 0, 0]
+
+def test_compare_flags_throughput_drops():
+    baseline = {"results": {"fast": {"throughput": 100.0}, "slow": {"throughput": 100.0}}}
+    report = {"results": {"fast": {"throughput": 95.0}, "slow": {"throughput": 70.0}}}
+    assert compare(report, baseline, 0.2) == [("slow", 100.0, 70.0)]
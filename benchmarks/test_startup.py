@@ -0,0 +1,21 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.startup import HEAVY_MODULES, ROOT, _entry_point_imports, _PROBE
+
+def heavy_modules_loaded(modules):
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(modules=modules, heavy=HEAVY_MODULES)],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])["loaded"]
+
+def test_pricing_models_import_without_scipy_or_plotting():
+    modules = ["models.american.Binomial", "models.american.LongstaffSchwartz", "models.european.BlackScholes",
+               "models.european.ImpliedVolatility", "models.european.MonteCarlo", "models.cache", "models.strategy",
+               "models.surface", "matplot.heatmap_plotting", "matplot.payoff_plotting"]
+    assert heavy_modules_loaded(modules) == []
+
+def test_entry_point_imports_are_parsed_in_order():
+    modules = _entry_point_imports(f"{ROOT}/main.py")
+    assert modules[:3] == ["io", "time", "streamlit"]
+    assert "models.cache" in modules
@@ -0,0 +1 @@
+# Lets pytest import the project packages (models, db, ...) from test files placed next to them
@@ -1,45 +1,297 @@
-"""
-import mysql.connector
-import streamlit as st
-
-# Function to insert data into MySQL table
-@st.cache_data(ttl=600)
-def insert_input_into_db(table_name, _params):
-    connection = mysql.connector.connect(
-        host=st.secrets["connections"]["mysql"]["host"],
-        user=st.secrets["connections"]["mysql"]["username"],
-        password=st.secrets["connections"]["mysql"]["password"],
-        database=st.secrets["connections"]["mysql"]["database"],
-        port=st.secrets["connections"]["mysql"]["port"]
-    )
-    cursor = connection.cursor()
-
-    columns = ', '.join(_params.keys())
-    placeholders = ', '.join(['%s'] * len(_params))
-    query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-
-    cursor.execute(query, tuple(_params.values()))
-    connection.commit()
-
-    cursor.close()
-    connection.close()
-
-# Function to query specifc table
-@st.cache_data(ttl=600)
-def query_table(table_name):
-    connection = mysql.connector.connect(
-        host=st.secrets["connections"]["mysql"]["host"],
-        user=st.secrets["connections"]["mysql"]["username"],
-        password=st.secrets["connections"]["mysql"]["password"],
-        database=st.secrets["connections"]["mysql"]["database"],
-        port=st.secrets["connections"]["mysql"]["port"]
-    )
-    cursor = connection.cursor()
-    query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-
-    cursor.execute(query)
-    connection.commit()
-
-    cursor.close()
-    connection.close()
-"""
\ No newline at end of file
+import atexit
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Local stand-in for MySQL when no Streamlit secrets are configured
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pricing.sqlite3")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Insertion-order key added to every table so pages are stable
+_ROW_ID = "row_id"
+
+def database_errors():
+    """
+    DB-API error classes of the drivers in use, for narrow except clauses.
+
+    MySQL errors are only included once mysql_pool has imported the driver, so this
+    never pays for importing it.
+
+    Returns:
+    tuple: Exception classes
+    """
+    mysql_connector = sys.modules.get("mysql.connector")
+    if mysql_connector is None:
+        return (sqlite3.Error,)
+    return (sqlite3.Error, mysql_connector.Error)
+
+def _check_identifier(name):
+    # Table and column names are interpolated into SQL, so only plain identifiers are allowed
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+class ConnectionPool:
+    def __init__(self, connect, size=4, placeholder="%s", row_id_type="BIGINT AUTO_INCREMENT PRIMARY KEY"):
+        """
+        Initialize a fixed-size pool of DB-API connections.
+
+        Connections are opened lazily up to size and handed back to the pool after use
+        instead of being closed, so callers stop paying a connect per statement.
+
+        Parameters:
+        connect (callable): Zero-argument function returning a new DB-API connection
+        size (int): Maximum number of open connections
+        placeholder (str): Parameter placeholder of the driver ('%s' for MySQL, '?' for SQLite)
+        row_id_type (str): SQL type of the auto-incrementing row key ensure_table adds
+        """
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all = []
+        self._lock = threading.Lock()
+        self.placeholder = placeholder
+        self.row_id_type = row_id_type
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+                with self._lock:
+                    self._all.append(connection)
+            try:
+                yield connection
+            finally:
+                self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            for connection in self._all:
+                connection.close()
+            self._all.clear()
+        self._idle = queue.LifoQueue()
+
+def sqlite_pool(path=DEFAULT_SQLITE_PATH, size=4):
+    """
+    Create a pool of SQLite connections, used locally and in tests as a stand-in for MySQL.
+
+    Returns:
+    ConnectionPool: Pool of SQLite connections
+    """
+    return ConnectionPool(lambda: sqlite3.connect(path, check_same_thread=False), size=size, placeholder="?",
+                          row_id_type="INTEGER PRIMARY KEY AUTOINCREMENT")
+
+def mysql_pool(size=4):
+    """
+    Create a pool of MySQL connections from the Streamlit secrets.
+
+    Returns:
+    ConnectionPool: Pool of MySQL connections
+    """
+    import mysql.connector
+    import streamlit as st
+
+    settings = st.secrets["connections"]["mysql"]
+    return ConnectionPool(lambda: mysql.connector.connect(
+        host=settings["host"],
+        user=settings["username"],
+        password=settings["password"],
+        database=settings["database"],
+        port=settings["port"]
+    ), size=size, placeholder="%s")
+
+def ensure_table(pool, table_name, columns):
+    """
+    Create table_name with REAL columns if it does not exist yet.
+
+    The table also gets an auto-incrementing row_id key, which query_table orders by.
+
+    Parameters:
+    pool (ConnectionPool): Pool to use
+    table_name (str): Table to create
+    columns (iterable): Column names
+    """
+    column_sql = ", ".join(f"{_check_identifier(column)} REAL" for column in columns)
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {_check_identifier(table_name)} "
+                       f"({_ROW_ID} {pool.row_id_type}, {column_sql})")
+        connection.commit()
+        cursor.close()
+
+class BufferedInserter:
+    def __init__(self, pool, flush_size=500, flush_interval=2.0):
+        """
+        Initialize a buffer that writes rows in bulk with executemany.
+
+        Rows are grouped per (table, columns) and flushed when flush_size rows are
+        pending, by a background timer once flush_interval seconds have passed, and on
+        close. A flush is one transaction: if any insert fails it is rolled back and the
+        rows stay pending for the next flush, so nothing is lost before it is committed.
+
+        Parameters:
+        pool (ConnectionPool): Pool to write through
+        flush_size (int): Pending rows that trigger a flush
+        flush_interval (float): Seconds after which pending rows are flushed
+        """
+        self.pool = pool
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.last_error = None
+        self._pending = {}
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = None
+
+    def _start_timer(self):
+        # Started on the first row, so idle inserters cost no thread
+        if self._timer is None and not self._closed.is_set():
+            self._timer = threading.Thread(target=self._flush_periodically, name="BufferedInserter", daemon=True)
+            self._timer.start()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except database_errors() as e:
+                # The rows stay pending and are retried on the next tick
+                self.last_error = e
+
+    def add(self, table_name, params):
+        key = (_check_identifier(table_name), tuple(_check_identifier(column) for column in params))
+        with self._lock:
+            self._pending.setdefault(key, []).append(tuple(params.values()))
+            self._pending_rows += 1
+            due = self._pending_rows >= self.flush_size
+            self._start_timer()
+        if due:
+            self.flush()
+
+    def pending_rows(self):
+        with self._lock:
+            return self._pending_rows
+
+    def flush(self):
+        """
+        Write every pending row in one transaction, one executemany per (table, columns) group.
+
+        On a database error the transaction is rolled back, the rows are put back in
+        front of any added meanwhile and the error is raised.
+
+        Returns:
+        int: Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._pending_rows = 0
+            if not pending:
+                return 0
+
+            written = 0
+            try:
+                with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        for (table_name, columns), rows in pending.items():
+                            placeholders = ", ".join([self.pool.placeholder] * len(columns))
+                            query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+                            cursor.executemany(query, rows)
+                            written += len(rows)
+                        connection.commit()
+                    except BaseException:
+                        connection.rollback()
+                        raise
+                    finally:
+                        cursor.close()
+            except BaseException:
+                with self._lock:
+                    for key, rows in self._pending.items():
+                        pending.setdefault(key, []).extend(rows)
+                    self._pending = pending
+                    self._pending_rows = sum(len(rows) for rows in pending.values())
+                raise
+            self.last_error = None
+            return written
+
+    def close(self):
+        """
+        Stop the flush timer and write whatever is still pending.
+        """
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+
+_default_inserter = None
+_known_tables = set()
+_default_lock = threading.Lock()
+
+def get_inserter():
+    """
+    Return the process-wide inserter, backed by MySQL when secrets are configured and SQLite otherwise.
+
+    Returns:
+    BufferedInserter: The shared inserter
+    """
+    global _default_inserter
+    with _default_lock:
+        if _default_inserter is None:
+            try:
+                pool = mysql_pool()
+            except Exception:
+                # No MySQL driver or no secrets configured: log locally instead
+                pool = sqlite_pool()
+            _default_inserter = BufferedInserter(pool)
+            atexit.register(_default_inserter.close)
+        return _default_inserter
+
+# Function to insert data into the table (buffered, written in bulk)
+def insert_input_into_db(table_name, params, inserter=None):
+    inserter = inserter or get_inserter()
+    if (id(inserter.pool), table_name) not in _known_tables:
+        ensure_table(inserter.pool, table_name, params.keys())
+        _known_tables.add((id(inserter.pool), table_name))
+    inserter.add(table_name, params)
+
+# Function to query one page of a specific table
+def query_table(table_name, page=0, page_size=1000, pool=None):
+    """
+    Read one page of a table into a DataFrame, in insertion order.
+
+    Parameters:
+    table_name (str): Table to read
+    page (int): Zero-based page number
+    page_size (int): Rows per page
+    pool (ConnectionPool): Pool to use (defaults to the shared inserter's pool)
+
+    Returns:
+    pd.DataFrame: The rows of the requested page, without the row_id key
+    """
+    if pool is None:
+        inserter = get_inserter()
+        # Make rows that are still buffered visible to the reader
+        inserter.flush()
+        pool = inserter.pool
+    query = (f"SELECT * FROM {_check_identifier(table_name)} ORDER BY {_ROW_ID} "
+             f"LIMIT {pool.placeholder} OFFSET {pool.placeholder}")
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(query, (int(page_size), int(page) * int(page_size)))
+        rows = cursor.fetchall()
+        columns = [description[0] for description in cursor.description]
+        cursor.close()
+    return pd.DataFrame(rows, columns=columns).drop(columns=_ROW_ID)
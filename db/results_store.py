@@ -0,0 +1,386 @@
+import json
+import atexit
+import contextlib
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+_META_FILE = "meta.json"
+_INDEX_FILE = "index.jsonl"
+
+def _to_ns(value):
+    # Accepts None, epoch nanoseconds, or anything pandas understands as a timestamp
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    return pd.Timestamp(value).value
+
+class ResultsStore:
+    def __init__(self, root=DEFAULT_RESULTS_PATH, buffer_rows=10_000, flush_interval=5.0, compact_after=64):
+        """
+        Initialize an append-only columnar store for pricing runs.
+
+        Runs are buffered and written in batches: every flush writes one shard directory
+        per (model, columns) group, holding a .npy file per column and a small JSON header
+        with the model, row count and time range. Buffered runs are written once
+        buffer_rows are pending, by a background timer after flush_interval seconds, on
+        close, and before every read. Shards are never modified after they are written,
+        and reads memory-map the columns so only the pages that are actually touched are
+        loaded.
+
+        The headers are also appended to an index file, so listing shards reads one file
+        instead of opening every shard. Once compact_after shards smaller than
+        buffer_rows have accumulated, consecutive ones of the same model are merged;
+        the shards they replace are deleted once no read of this store is using them.
+
+        Parameters:
+        root (str): Directory holding the shards
+        buffer_rows (int): Pending rows that trigger a flush; larger runs are written directly
+        flush_interval (float): Seconds after which pending rows are flushed
+        compact_after (int): Small shards that trigger a compaction (0 disables it)
+        """
+        self.root = root
+        self.buffer_rows = buffer_rows
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        os.makedirs(root, exist_ok=True)
+        self._pending = {}
+        self._pending_rows = 0
+        self._lock = threading.RLock()
+        self._readers = 0
+        self._superseded = set()
+        self._closed = threading.Event()
+        self._timer = None
+
+    def append(self, model, columns, timestamp=None):
+        """
+        Add one pricing run (inputs, prices, Greeks...) to the store.
+
+        Parameters:
+        model (str): Pricing model that produced the run
+        columns (dict): Column name -> scalar or 1-D array; scalars are repeated
+        timestamp (int or array): Epoch nanoseconds per row (defaults to now)
+
+        Returns:
+        int: Number of rows added
+        """
+        arrays = {name: np.atleast_1d(np.asarray(values)) for name, values in columns.items()}
+        rows = max(len(values) for values in arrays.values())
+        arrays = {name: np.broadcast_to(values, (rows,)) for name, values in arrays.items()}
+        if timestamp is None:
+            timestamp = time.time_ns()
+        arrays["timestamp"] = np.broadcast_to(np.asarray(timestamp, dtype=np.int64), (rows,))
+
+        with self._lock:
+            if rows >= self.buffer_rows:
+                # Large runs go straight to their own shard, after the runs buffered before them
+                self.flush()
+                self._write_shard(model, arrays)
+                return rows
+            self._pending.setdefault((model, tuple(sorted(arrays))), []).append(arrays)
+            self._pending_rows += rows
+            if self._pending_rows >= self.buffer_rows:
+                self.flush()
+            elif self._timer is None and not self._closed.is_set():
+                self._timer = threading.Thread(target=self._flush_periodically, name="ResultsStore", daemon=True)
+                self._timer.start()
+        return rows
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered runs, one shard per (model, columns) group.
+
+        Returns:
+        int: Number of rows written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_rows = 0
+            written = 0
+            for (model, names), runs in pending.items():
+                arrays = {name: np.concatenate([run[name] for run in runs]) for name in names}
+                self._write_shard(model, arrays)
+                written += len(arrays["timestamp"])
+            if written and self.compact_after:
+                small = sum(meta["rows"] < self.buffer_rows for _, meta in self._index())
+                if small >= self.compact_after:
+                    self.compact()
+            return written
+
+    def close(self):
+        """
+        Stop the flush timer and write whatever is still buffered.
+        """
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+
+    def _write_shard(self, model, arrays, name=None, replaces=None):
+        name = name or f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        staging = os.path.join(self.root, "." + name)
+        os.makedirs(staging)
+        for column, values in arrays.items():
+            np.save(os.path.join(staging, f"{column}.npy"), np.ascontiguousarray(values))
+        meta = {
+            "model": model,
+            "rows": len(arrays["timestamp"]),
+            "columns": sorted(arrays),
+            "min_timestamp": int(arrays["timestamp"].min()),
+            "max_timestamp": int(arrays["timestamp"].max()),
+        }
+        if replaces:
+            # Lets _index drop the merged shards if a compaction stops before removing them
+            meta["replaces"] = list(replaces)
+        with open(os.path.join(staging, _META_FILE), "w") as f:
+            json.dump(meta, f)
+        # Publish the shard atomically so readers never see a partial write
+        os.rename(staging, os.path.join(self.root, name))
+        with open(os.path.join(self.root, _INDEX_FILE), "a") as f:
+            f.write(json.dumps({"shard": name, **meta}) + "\n")
+        return name
+
+    def _index(self):
+        """
+        Read the shard headers from the index, in append order.
+
+        Shards missing from the index (written before it existed, or by a writer that
+        stopped between publishing a shard and indexing it) are indexed on the way.
+        Shards replaced by a published compacted shard are left out and removed.
+
+        Returns:
+        list: (shard_name, meta) pairs
+        """
+        entries = {}
+        index_path = os.path.join(self.root, _INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    try:
+                        meta = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line: the shard is indexed again below
+                        continue
+                    entries[meta.pop("shard")] = meta
+        # Shards waiting for reads to finish before removal are already out of the index
+        published = {name for name in os.listdir(self.root) if not name.startswith(".") and name != _INDEX_FILE} - self._superseded
+        missing = sorted(published - entries.keys())
+        for name in missing:
+            with open(os.path.join(self.root, name, _META_FILE)) as meta_file:
+                entries[name] = json.load(meta_file)
+        superseded = {old for name in published for old in entries[name].get("replaces", ())} & published
+        missing = [name for name in missing if name not in superseded]
+        if missing:
+            with open(index_path, "a") as f:
+                for name in missing:
+                    f.write(json.dumps({"shard": name, **entries[name]}) + "\n")
+        if superseded:
+            self._remove_shards(superseded)
+        # Compaction may have removed shards that are still listed
+        live = published - superseded
+        return sorted(((name, meta) for name, meta in entries.items() if name in live), key=lambda entry: entry[0])
+
+    @contextlib.contextmanager
+    def _reading(self):
+        # Keeps compaction from deleting shards while a read still has them memory-mapped
+        with self._lock:
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._readers -= 1
+                if not self._readers:
+                    self._remove_shards(())
+
+    def _remove_shards(self, names):
+        with self._lock:
+            self._superseded.update(names)
+            if self._readers:
+                return
+            for name in self._superseded:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+            self._superseded.clear()
+
+    def compact(self, max_rows=1_000_000):
+        """
+        Merge runs of consecutive small shards of the same model and columns.
+
+        Merged shards keep the name prefix of their first shard, so append order is
+        preserved, and record the shards they replace, so a compaction interrupted at any
+        point never counts a row twice. The index is rewritten atomically before the old
+        shards are removed, which waits for reads in progress to finish.
+
+        Parameters:
+        max_rows (int): Largest shard compaction produces
+
+        Returns:
+        int: Number of shards removed
+        """
+        with self._lock:
+            entries = self._index()
+            groups, group = [], []
+            for name, meta in entries:
+                fits = (group and meta["model"] == group[0][1]["model"] and meta["columns"] == group[0][1]["columns"]
+                        and sum(m["rows"] for _, m in group) + meta["rows"] <= max_rows)
+                if meta["rows"] < self.buffer_rows and (fits or not group):
+                    group.append((name, meta))
+                    continue
+                groups.append(group)
+                group = [(name, meta)] if meta["rows"] < self.buffer_rows else []
+            groups.append(group)
+
+            removed = []
+            for group in groups:
+                if len(group) < 2:
+                    continue
+                first, meta = group[0]
+                arrays = {column: np.concatenate([self.column(name, column) for name, _ in group]) for column in meta["columns"]}
+                merged = f"{first.split('-')[0]}-{uuid.uuid4().hex[:8]}"
+                self._write_shard(meta["model"], arrays, merged, replaces=[name for name, _ in group])
+                removed.extend(name for name, _ in group)
+            if not removed:
+                return 0
+
+            removed_names = set(removed)
+            kept = [(name, meta) for name, meta in self._index() if name not in removed_names]
+            staging = os.path.join(self.root, "." + _INDEX_FILE)
+            with open(staging, "w") as f:
+                for name, meta in kept:
+                    f.write(json.dumps({"shard": name, **meta}) + "\n")
+            os.replace(staging, os.path.join(self.root, _INDEX_FILE))
+            self._remove_shards(removed)
+            return len(removed)
+
+    def shards(self, model=None, start=None, end=None):
+        """
+        List the shards that can contain rows for model between start and end.
+
+        Buffered runs are flushed first so they are visible to the read. The listed
+        shards can be removed by a later compaction; count and page hold them until
+        they are done.
+
+        Returns:
+        list: (shard_name, meta) pairs in append order
+        """
+        with self._lock:
+            self.flush()
+            entries = self._index()
+        start, end = _to_ns(start), _to_ns(end)
+        found = []
+        for name, meta in entries:
+            if model is not None and meta["model"] != model:
+                continue
+            if start is not None and meta["max_timestamp"] < start:
+                continue
+            if end is not None and meta["min_timestamp"] > end:
+                continue
+            found.append((name, meta))
+        return found
+
+    def column(self, shard, column):
+        """
+        Memory-map one column of a shard without reading it into RAM.
+
+        Returns:
+        np.memmap: Read-only view of the column
+        """
+        return np.load(os.path.join(self.root, shard, f"{column}.npy"), mmap_mode="r")
+
+    def _row_index(self, shard, meta, start, end):
+        # Rows of one shard inside [start, end]; None means every row matches
+        if (start is None or meta["min_timestamp"] >= start) and (end is None or meta["max_timestamp"] <= end):
+            return None
+        timestamps = self.column(shard, "timestamp")
+        mask = np.ones(meta["rows"], dtype=bool)
+        if start is not None:
+            mask &= timestamps >= start
+        if end is not None:
+            mask &= timestamps <= end
+        return np.flatnonzero(mask)
+
+    def count(self, model=None, start=None, end=None):
+        """
+        Count the rows matching the filters.
+
+        Returns:
+        int: Number of matching rows
+        """
+        start, end = _to_ns(start), _to_ns(end)
+        total = 0
+        with self._reading():
+            for shard, meta in self.shards(model, start, end):
+                index = self._row_index(shard, meta, start, end)
+                total += meta["rows"] if index is None else len(index)
+        return total
+
+    def page(self, offset=0, limit=1000, model=None, start=None, end=None, columns=None):
+        """
+        Read one page of matching rows into a DataFrame.
+
+        Only the requested slice of each memory-mapped column is copied, so paging
+        through millions of rows keeps memory proportional to the page size.
+
+        Parameters:
+        offset (int): Number of matching rows to skip
+        limit (int): Maximum number of rows to return
+        model (str): Only rows from this model
+        start: Only rows at or after this time (epoch ns or timestamp-like)
+        end: Only rows at or before this time (epoch ns or timestamp-like)
+        columns (list): Columns to return (defaults to every column of the shards read)
+
+        Returns:
+        pd.DataFrame: The matching rows, with 'model' and a datetime 'timestamp' column
+        """
+        start, end = _to_ns(start), _to_ns(end)
+        frames = []
+        with self._reading():
+            for shard, meta in self.shards(model, start, end):
+                if limit <= 0:
+                    break
+                index = self._row_index(shard, meta, start, end)
+                matching = meta["rows"] if index is None else len(index)
+                if offset >= matching:
+                    offset -= matching
+                    continue
+                rows = slice(offset, offset + limit) if index is None else index[offset:offset + limit]
+                offset = 0
+                names = [c for c in (columns or meta["columns"]) if c in meta["columns"]]
+                # Copy out of the memory map so the frame outlives the shard files
+                frame = pd.DataFrame({name: np.array(self.column(shard, name)[rows]) for name in names})
+                frame.insert(0, "model", meta["model"])
+                frames.append(frame)
+                limit -= len(frame)
+
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        if "timestamp" in df:
+            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ns")
+        return df
+
+_shared_stores = {}
+_shared_lock = threading.Lock()
+
+def get_results_store(root=DEFAULT_RESULTS_PATH):
+    """
+    Return the process-wide store for root, so runs from every session share one buffer.
+
+    Returns:
+    ResultsStore: The shared store, flushed at interpreter exit
+    """
+    with _shared_lock:
+        store = _shared_stores.get(root)
+        if store is None:
+            store = _shared_stores[root] = ResultsStore(root)
+            atexit.register(store.close)
+        return store
@@ -0,0 +1,79 @@
+import sqlite3
+import time
+
+import pytest
+
+from db.db import BufferedInserter, ensure_table, insert_input_into_db, query_table, sqlite_pool
+
+COLUMNS = ("StockPrice", "StrikePrice")
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = sqlite_pool(str(tmp_path / "test.sqlite3"))
+    ensure_table(pool, "Inputs", COLUMNS)
+    yield pool
+    pool.close()
+
+def count(pool, table_name="Inputs"):
+    return len(query_table(table_name, page_size=10_000, pool=pool))
+
+def test_rows_are_written_in_bulk_at_flush_size(pool):
+    inserter = BufferedInserter(pool, flush_size=3, flush_interval=60)
+    for S in (90.0, 100.0):
+        inserter.add("Inputs", {"StockPrice": S, "StrikePrice": 100.0})
+    assert count(pool) == 0
+    inserter.add("Inputs", {"StockPrice": 110.0, "StrikePrice": 100.0})
+    assert count(pool) == 3
+    assert inserter.pending_rows() == 0
+    inserter.close()
+
+def test_timer_flushes_without_further_adds(pool):
+    inserter = BufferedInserter(pool, flush_size=100, flush_interval=0.05)
+    inserter.add("Inputs", {"StockPrice": 100.0, "StrikePrice": 100.0})
+    deadline = time.monotonic() + 5
+    while count(pool) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count(pool) == 1
+    inserter.close()
+
+def test_close_flushes_pending_rows(pool):
+    inserter = BufferedInserter(pool, flush_size=100, flush_interval=60)
+    inserter.add("Inputs", {"StockPrice": 100.0, "StrikePrice": 100.0})
+    inserter.close()
+    assert count(pool) == 1
+
+def test_failed_flush_rolls_back_and_keeps_rows(pool):
+    inserter = BufferedInserter(pool, flush_size=100, flush_interval=60)
+    inserter.add("Inputs", {"StockPrice": 100.0, "StrikePrice": 100.0})
+    inserter.add("Missing", {"StockPrice": 100.0})
+    with pytest.raises(sqlite3.OperationalError):
+        inserter.flush()
+    # The insert into Inputs ran before the failure but was not committed
+    assert count(pool) == 0
+    assert inserter.pending_rows() == 2
+
+    ensure_table(pool, "Missing", ["StockPrice"])
+    assert inserter.flush() == 2
+    assert count(pool) == 1
+    assert count(pool, "Missing") == 1
+    inserter.close()
+
+def test_insert_input_creates_table(pool):
+    inserter = BufferedInserter(pool, flush_size=1, flush_interval=60)
+    insert_input_into_db("BlackScholesInputs", {"StockPrice": 100.0, "Volatility": 0.2}, inserter=inserter)
+    df = query_table("BlackScholesInputs", pool=pool)
+    assert list(df.columns) == ["StockPrice", "Volatility"]
+    assert df.iloc[0].tolist() == [100.0, 0.2]
+    inserter.close()
+
+def test_query_table_pages(pool):
+    inserter = BufferedInserter(pool, flush_size=100, flush_interval=60)
+    for S in range(25):
+        inserter.add("Inputs", {"StockPrice": float(24 - S), "StrikePrice": 100.0})
+    inserter.close()
+    with pool.connection() as connection:
+        # An index on the data must not change the page order
+        connection.execute("CREATE INDEX InputsByPrice ON Inputs (StockPrice, StrikePrice)")
+    df = query_table("Inputs", page=2, page_size=10, pool=pool)
+    assert df["StockPrice"].tolist() == [4.0, 3.0, 2.0, 1.0, 0.0]
+    assert list(df.columns) == list(COLUMNS)
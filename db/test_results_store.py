@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from db.results_store import ResultsStore
+
+def shard_dirs(root):
+    return sorted(name for name in os.listdir(root) if not name.startswith(".") and name != "index.jsonl")
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path), buffer_rows=100, flush_interval=60, compact_after=0)
+    yield store
+    store.close()
+
+def test_small_runs_are_batched_into_one_shard(store):
+    for i in range(10):
+        store.append("Black-Scholes", {"StockPrice": 100.0 + i, "CallPrice": 10.0}, timestamp=i)
+    assert shard_dirs(store.root) == []
+    # Reads flush the buffer first
+    assert store.count() == 10
+    assert len(shard_dirs(store.root)) == 1
+    df = store.page()
+    assert df["StockPrice"].tolist() == [100.0 + i for i in range(10)]
+    assert (df["model"] == "Black-Scholes").all()
+
+def test_large_runs_are_written_after_buffered_ones(store):
+    store.append("Black-Scholes", {"StockPrice": 1.0}, timestamp=0)
+    store.append("Black-Scholes Surface", {"StockPrice": np.arange(2.0, 202.0)}, timestamp=1)
+    df = store.page(limit=3)
+    assert df["StockPrice"].tolist() == [1.0, 2.0, 3.0]
+    assert df["model"].tolist() == ["Black-Scholes", "Black-Scholes Surface", "Black-Scholes Surface"]
+
+def test_close_flushes(tmp_path):
+    store = ResultsStore(str(tmp_path), buffer_rows=100, flush_interval=60)
+    store.append("Binomial", {"StockPrice": 100.0})
+    store.close()
+    assert ResultsStore(str(tmp_path)).count() == 1
+
+def test_filters_by_model_and_time(store):
+    for i in range(6):
+        store.append("Binomial" if i % 2 else "Monte-Carlo", {"StockPrice": float(i)}, timestamp=i * 1_000)
+    assert store.count(model="Binomial") == 3
+    assert store.page(model="Binomial", start=2_000, end=4_000)["StockPrice"].tolist() == [3.0]
+    assert store.count(start=pd.Timestamp(4_000, unit="ns")) == 2
+
+def test_index_lists_shards_without_their_headers(store):
+    store.append("Black-Scholes", {"StockPrice": np.arange(150.0)})
+    name = shard_dirs(store.root)[0]
+    os.remove(os.path.join(store.root, name, "meta.json"))
+    assert store.count() == 150
+
+def test_unindexed_shards_are_picked_up(store):
+    store.append("Black-Scholes", {"StockPrice": np.arange(150.0)})
+    os.remove(os.path.join(store.root, "index.jsonl"))
+    assert store.count() == 150
+    assert os.path.exists(os.path.join(store.root, "index.jsonl"))
+
+def test_compaction_merges_small_shards_in_order(tmp_path):
+    store = ResultsStore(str(tmp_path), buffer_rows=100, flush_interval=60, compact_after=0)
+    for i in range(5):
+        store.append("Black-Scholes", {"StockPrice": float(i)}, timestamp=i)
+        store.flush()
+    store.append("Black-Scholes", {"StockPrice": np.arange(5.0, 205.0)}, timestamp=5)
+    store.append("Binomial", {"StockPrice": 205.0}, timestamp=6)
+    store.flush()
+    assert len(shard_dirs(store.root)) == 7
+
+    assert store.compact() == 5
+    assert len(shard_dirs(store.root)) == 3
+    df = store.page(limit=1000)
+    assert df["StockPrice"].tolist() == list(np.arange(206.0))
+    assert df["model"].iloc[-1] == "Binomial"
+    store.close()
+
+def test_flush_compacts_automatically(tmp_path):
+    store = ResultsStore(str(tmp_path), buffer_rows=100, flush_interval=60, compact_after=4)
+    for i in range(4):
+        store.append("Black-Scholes", {"StockPrice": float(i)})
+        store.flush()
+    assert len(shard_dirs(store.root)) == 1
+    assert store.count() == 4
+    store.close()
+
+def small_shards(store, n):
+    for i in range(n):
+        store.append("Black-Scholes", {"StockPrice": float(i)}, timestamp=i)
+        store.flush()
+
+@pytest.mark.parametrize("crash_at", ["os.replace", "shutil.rmtree"])
+def test_interrupted_compaction_does_not_duplicate_rows(tmp_path, monkeypatch, crash_at):
+    store = ResultsStore(str(tmp_path), buffer_rows=100, flush_interval=60, compact_after=0)
+    small_shards(store, 4)
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+    with monkeypatch.context() as patch:
+        patch.setattr(crash_at, crash)
+        with pytest.raises(KeyboardInterrupt):
+            store.compact()
+
+    reopened = ResultsStore(str(tmp_path))
+    assert reopened.count() == 4
+    assert reopened.page()["StockPrice"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    # Shards replaced by the merged one are removed instead of being indexed again
+    assert len(shard_dirs(tmp_path)) == 1
+
+def test_compaction_waits_for_reads_in_progress(store, monkeypatch):
+    small_shards(store, 4)
+    row_index = store._row_index
+    def compact_mid_read(*args):
+        monkeypatch.setattr(store, "_row_index", row_index)
+        assert store.compact() == 4
+        # The shards being read are only removed once the read is done
+        assert len(shard_dirs(store.root)) == 5
+        return row_index(*args)
+    monkeypatch.setattr(store, "_row_index", compact_mid_read)
+    assert store.page()["StockPrice"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert len(shard_dirs(store.root)) == 1
+    assert store.count() == 4
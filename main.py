@@ -1,15 +1,25 @@
+import io
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 
-# from db.db import insert_input_into_db
+from db.db import insert_input_into_db
+from db.results_store import get_results_store
+
+from models.cache import cached_prices, cached_surface, pricing_cache
+from models.european.BlackScholes import black_scholes_greeks, black_scholes_prices
+from models.surface import SURFACE_MODELS, IncrementalSurface
+from models.strategy import Leg, Strategy
+
+from matplot.payoff_plotting import long_call_payoff, long_put_payoff, short_call_payoff, short_put_payoff, render_payoff_png, render_strategy_png
+from matplot.heatmap_plotting import render_heatmap_png
 
-from models.american.Binomial import BinomialAmericanOption
-from models.european.BlackScholes import BlackScholes
-from models.european.MonteCarlo import MonteCarlo
+from utils import instrumentation
+from utils.instrumentation import timed
 
-from matplot.payoff_plotting import long_call_payoff, long_put_payoff, short_call_payoff, short_put_payoff, plot_payoff
-from matplot.heatmap_plotting import heatmap_plot
+rerun_started = time.perf_counter_ns()
 
 # ---------------------------------
 # Tab config
@@ -46,8 +56,22 @@ with st.sidebar:
     elif "Monte-Carlo" in model:
         N = st.number_input("Number of Simulation Steps", value=10000.0, step=1000.0)
     
+    st.subheader("Heatmap Settings")
+    heatmap_model = st.selectbox("Heatmap Pricing Model", SURFACE_MODELS)
+    grid_size = st.slider("Heatmap Grid Size", min_value=5, max_value=500, value=10)
+    if heatmap_model == "Binomial":
+        heatmap_N = st.number_input("Heatmap Time Steps", value=50, step=1, min_value=1)
+    elif heatmap_model == "Monte-Carlo":
+        heatmap_N = st.number_input("Heatmap Simulation Steps", value=2000, step=500, min_value=2)
+    else:
+        heatmap_N = None
+
     calculate = st.button("Calculate")
 
+    # Timings are collected per browser session, so other sessions are neither slowed nor mixed in
+    debug = st.checkbox("Debug instrumentation")
+    instrumentation.activate(st.session_state.setdefault("instrumentation", instrumentation.Collector()) if debug else None)
+
     st.divider()
 
 
@@ -85,7 +109,7 @@ if calculate:
             "TimeToExpiry": T,
             "Simulations": N
         }
-    # insert_input_into_db(table_name, params)
+    insert_input_into_db(table_name, params)
 
     # ---------------------------------
     # Display option calculation inputs
@@ -132,15 +156,21 @@ if calculate:
     # ---------------------------------
     st.divider()
 
+    # Prices are cached on the inputs, so reruns with unchanged parameters are free
+    with timed("main.option_pricing"):
+        if "Black-Scholes" in model:
+            call_price, put_price = cached_prices("Black-Scholes", S, K, T, r, sigma)
+        elif "Binomial" in model:
+            call_price, put_price = cached_prices("Binomial", S, K, T, r, sigma, N)
+        elif "Monte-Carlo" in model:
+            call_price, put_price = cached_prices("Monte-Carlo", S, K, T, r, sigma, N, seed=0)
+
+    # Keep every priced input set (with Black-Scholes Greeks) in the columnar results store
+    results_store = get_results_store()
+    run_columns = {**params, "CallPrice": call_price, "PutPrice": put_price}
     if "Black-Scholes" in model:
-        bs = BlackScholes(S, K, T, r, sigma)
-        call_price, put_price = bs.call_price(), bs.put_price()
-    elif "Binomial" in model:
-        binomial = BinomialAmericanOption(S, K, T, r, sigma, N)
-        call_price, put_price = binomial.call_price(), binomial.put_price()
-    elif "Monte-Carlo" in model:
-        montecarlo = MonteCarlo(S, K, T, r, sigma, N)
-        call_price, put_price = montecarlo.call_price(), montecarlo.put_price()
+        run_columns.update(black_scholes_greeks(S, K, T, r, sigma))
+    results_store.append(model_name, run_columns)
 
     # Display Call and Put Prices
     call_price_col, put_price_col = st.columns([1,1], gap="small")
@@ -199,33 +229,48 @@ if calculate:
     st.divider()
 
     # Create grids of spot prices and volatilities
-    spot_prices = np.arange(0.75 * S, 1.25 * S, 5)  # Min spot price to max spot price
-    volatilities = np.linspace(0.01, 0.99, 10)  # Min volatility to max volatility
-
-    # Initialize matrices to hold call and put prices
-    call_prices = np.zeros((len(volatilities), len(spot_prices)))
-    put_prices = np.zeros((len(volatilities), len(spot_prices)))
-
-    # Calculate call and put prices for each combination of spot price and volatility
-    for i, sigma in enumerate(volatilities):
-        for j, S in enumerate(spot_prices):
-            bs = BlackScholes(S, K, T, r, sigma)
-            call_prices[i, j] = bs.call_price()
-            put_prices[i, j] = bs.put_price()
+    spot_prices = np.linspace(0.75 * S, 1.25 * S, grid_size)  # Min spot price to max spot price
+    volatilities = np.linspace(0.01, 0.99, grid_size)  # Min volatility to max volatility
+
+    # Calculate call and put prices for every (volatility, spot price) pair. Surfaces seen
+    # before come from the LRU cache; on a miss only the rows and columns that changed since
+    # this session's previous surface are repriced
+    surface = st.session_state.setdefault("heatmap_surface", IncrementalSurface())
+    with timed("main.heatmap_grid", grid_size * grid_size):
+        call_prices, put_prices = cached_surface(heatmap_model, spot_prices, volatilities, K, T, r, heatmap_N,
+                                                 seed=0, incremental=surface)
+    # Store a surface only when its inputs differ from the one this session stored last
+    surface_key = pricing_cache.make_key(heatmap_model, spot_prices, volatilities, K, T, r, heatmap_N)
+    if st.session_state.get("stored_surface") != surface_key:
+        results_store.append(f"{heatmap_model} Surface", {
+            "StockPrice": np.broadcast_to(spot_prices[None, :], call_prices.shape).ravel(),
+            "Volatility": np.broadcast_to(volatilities[:, None], call_prices.shape).ravel(),
+            "StrikePrice": K,
+            "InterestRate": r,
+            "TimeToExpiry": T,
+            "CallPrice": call_prices.ravel(),
+            "PutPrice": put_prices.ravel(),
+        })
+        st.session_state["stored_surface"] = surface_key
 
     call_col, put_col = st.columns(2)
 
     # Call heatmap
     with call_col:
         st.header("Call Price Heatmap")
-        call_heatmap = heatmap_plot(call_prices, spot_prices, volatilities, "Call")
-        st.pyplot(call_heatmap)
+        call_heatmap = render_heatmap_png(call_prices, spot_prices, volatilities, "Call")
+        st.image(call_heatmap)
 
     # Put heatmap
     with put_col:
         st.header("Put Price Heatmap")
-        call_heatmap = heatmap_plot(put_prices, spot_prices, volatilities, "Put")
-        st.pyplot(call_heatmap)
+        put_heatmap = render_heatmap_png(put_prices, spot_prices, volatilities, "Put")
+        st.image(put_heatmap)
+
+    cache_stats = pricing_cache.stats()
+    st.caption(f"Pricing cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+               f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['size']}/{cache_stats['maxsize']} entries. "
+               f"Last heatmap miss recomputed {surface.stats['computed']} of {surface.stats['cells']} cells")
 
 
     # ---------------------------------
@@ -244,13 +289,13 @@ if calculate:
 
     with payoff_long_call_col:
         st.header("Long Call P&L")
-        fig_call = plot_payoff(stock_prices, payoff_long_call, 'Long', 'Call', 'g')
-        st.pyplot(fig_call)
+        fig_call = render_payoff_png(stock_prices, payoff_long_call, 'Long', 'Call', 'g')
+        st.image(fig_call)
 
     with payoff_long_put_col:
         st.header("Long Put P&L")
-        fig_put = plot_payoff(stock_prices, payoff_long_put, 'Long', 'Put', 'r')
-        st.pyplot(fig_put)
+        fig_put = render_payoff_png(stock_prices, payoff_long_put, 'Long', 'Put', 'r')
+        st.image(fig_put)
 
     # Calculate the payoff for the short call & put options
     payoff_short_call = short_call_payoff(stock_prices, K, call_price)
@@ -260,10 +305,67 @@ if calculate:
 
     with payoff_short_call_col:
         st.header("Short Call P&L")
-        fig_call = plot_payoff(stock_prices, payoff_short_call, 'Short', 'Call', 'orange')
-        st.pyplot(fig_call)
+        fig_call = render_payoff_png(stock_prices, payoff_short_call, 'Short', 'Call', 'orange')
+        st.image(fig_call)
 
     with payoff_short_put_col:
         st.header("Short Put P&L")
-        fig_put = plot_payoff(stock_prices, payoff_short_put, 'Short', 'Put', 'blue')
-        st.pyplot(fig_put)
+        fig_put = render_payoff_png(stock_prices, payoff_short_put, 'Short', 'Put', 'blue')
+        st.image(fig_put)
+
+
+# ---------------------------------
+# Strategy Builder
+# ---------------------------------
+st.divider()
+st.header("Strategy P&L")
+
+# Lives outside the Calculate branch so the legs can be edited without recalculating.
+# Defaults to an iron condor around the strike, priced with Black-Scholes at the current inputs
+condor_strikes = np.array([0.8, 0.9, 1.1, 1.2]) * K
+condor_calls, condor_puts = black_scholes_prices(S, condor_strikes, T, r, sigma)
+default_legs = pd.DataFrame({
+    "Position": ["long", "short", "short", "long"],
+    "Type": ["put", "put", "call", "call"],
+    "Strike": condor_strikes,
+    "Quantity": [1.0, 1.0, 1.0, 1.0],
+    "Premium": np.round(np.where([False, False, True, True], condor_calls, condor_puts), 2),
+    "Expiry": [T, T, T, T],
+})
+legs_df = st.data_editor(default_legs, num_rows="dynamic", key="strategy_legs",
+                         column_config={
+                             "Position": st.column_config.SelectboxColumn(options=["long", "short"], required=True),
+                             "Type": st.column_config.SelectboxColumn(options=["call", "put"], required=True),
+                         }).dropna()
+
+if len(legs_df):
+    strategy = Strategy([Leg(row.Position, row.Type, row.Strike, row.Quantity, row.Premium, row.Expiry)
+                         for row in legs_df.itertuples()])
+    strategy_prices = np.linspace(0.5 * S, 1.5 * S, 2001)
+    with timed("main.strategy_pnl", len(legs_df) * len(strategy_prices)):
+        strategy_summary = strategy.summary(strategy_prices, r, sigma)
+
+    max_profit_col, max_loss_col, break_even_col = st.columns(3)
+    format_bound = lambda value: "Unlimited" if np.isinf(value) else f"${value:.2f}"
+    max_profit_col.metric("Max Profit", format_bound(strategy_summary["max_profit"]))
+    max_loss_col.metric("Max Loss", format_bound(strategy_summary["max_loss"]))
+    break_even_col.metric("Break-evens", ", ".join(f"${price:.2f}" for price in strategy_summary["break_evens"]) or "None")
+    st.image(render_strategy_png(strategy_prices, strategy_summary["pnl"], strategy_summary["break_evens"]))
+
+
+# ---------------------------------
+# Debug Panel
+# ---------------------------------
+if debug:
+    instrumentation.record("main.rerun", time.perf_counter_ns() - rerun_started)
+    with st.expander("Instrumentation", expanded=True):
+        stats = instrumentation.snapshot()
+        if stats:
+            st.dataframe(pd.DataFrame(stats).drop(columns="histogram_us"))
+            st.dataframe(pd.DataFrame({section["section"]: section["histogram_us"] for section in stats}).T)
+        st.download_button("Export JSON lines", instrumentation.export_jsonl(io.StringIO()),
+                           file_name="instrumentation.jsonl", mime="application/json")
+        if st.button("Log to server"):
+            instrumentation.export_jsonl()
+        if st.button("Reset counters"):
+            instrumentation.reset()
@@ -1,17 +1,49 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-def heatmap_plot(prices, spot_prices, volatilities, option_type):
-    # Plot heatmap
-    fig, ax = plt.subplots(figsize=(10, 8))
+from matplot.rendering import cached_png, figure_to_png, new_figure
+from utils.instrumentation import instrumented
 
-    sns.heatmap(prices, ax=ax, annot=True, fmt=".2f", xticklabels=np.round(spot_prices, 2), yticklabels=np.round(volatilities, 2), cmap="RdYlGn", cbar_kws={'label': 'Option Price'})
+# Above this many cells, per-cell text annotations are skipped
+ANNOTATION_CELL_LIMIT = 400
+# Maximum number of tick labels drawn per axis
+MAX_TICK_LABELS = 12
+
+def _draw_heatmap_png(prices, spot_prices, volatilities, option_type):
+    fig, ax = new_figure(figsize=(10, 8))
+    # A single array-backed image instead of one patch (and label) per cell
+    image = ax.imshow(prices, cmap="RdYlGn", aspect="auto", interpolation="nearest")
+    fig.colorbar(image, ax=ax, label="Option Price")
+
+    rows, columns = prices.shape
+    if prices.size <= ANNOTATION_CELL_LIMIT:
+        for i in range(rows):
+            for j in range(columns):
+                ax.text(j, i, f"{prices[i, j]:.2f}", ha="center", va="center", fontsize=8)
+
+    x_ticks = np.unique(np.linspace(0, columns - 1, min(columns, MAX_TICK_LABELS)).astype(int))
+    y_ticks = np.unique(np.linspace(0, rows - 1, min(rows, MAX_TICK_LABELS)).astype(int))
+    ax.set_xticks(x_ticks, labels=np.round(spot_prices[x_ticks], 2))
+    ax.set_yticks(y_ticks, labels=np.round(volatilities[y_ticks], 2))
     ax.set_title(f'{option_type} Price Heatmap')
     ax.set_xlabel('Spot Price')
     ax.set_ylabel('Volatility')
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+@instrumented()
+def render_heatmap_png(prices, spot_prices, volatilities, option_type):
+    """
+    Render a price heatmap to PNG bytes, reusing the cached image for identical inputs.
 
-    plt.tight_layout()
-    plt.show()
+    Parameters:
+    prices (np.ndarray): Prices of shape (len(volatilities), len(spot_prices))
+    spot_prices (np.ndarray): Spot prices for the columns
+    volatilities (np.ndarray): Volatilities for the rows
+    option_type (str): 'Call' or 'Put', used in the title
 
-    return fig
\ No newline at end of file
+    Returns:
+    bytes: The PNG image
+    """
+    prices, spot_prices, volatilities = np.asarray(prices), np.asarray(spot_prices), np.asarray(volatilities)
+    return cached_png("heatmap", (prices, spot_prices, volatilities, option_type),
+                      lambda: _draw_heatmap_png(prices, spot_prices, volatilities, option_type))
\ No newline at end of file
@@ -1,5 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from matplot.rendering import cached_png, figure_to_png, new_figure
+from utils.instrumentation import instrumented
 
 def long_call_payoff(stock_prices, strike_price, premium):
     # If stock price > strike price, the payoff is stock price - strike price - premium
@@ -21,20 +23,71 @@ def short_put_payoff(stock_prices, strike_price, premium):
     # Else it's stock price - strike price + premium
     return np.where(stock_prices > strike_price, 0, stock_prices - strike_price) + premium
 
-def plot_payoff(stock_prices, payoff, position, option_type, color):
-    fig, ax = plt.subplots()
+def _draw_payoff_png(stock_prices, payoff, position, option_type, color):
+    fig, ax = new_figure()
     ax.spines['bottom'].set_position('zero')
     ax.plot(stock_prices, payoff, label=f'{position} {option_type}', color=color)
-    
+
     multiplier = 2.0 if option_type == "Put" else 1.0
     # set y negative and positive limits
     max_y = max(abs(payoff.min()), abs(payoff.max())) * multiplier
     ax.set_ylim(-max_y, max_y)
-    
-    plt.xlabel('Stock Price')
-    plt.ylabel('P&L')
-    plt.legend()
-    plt.title(f'{position} {option_type} Option Payoff Diagram')
-    plt.grid(True)
-    
-    return fig
\ No newline at end of file
+
+    ax.set_xlabel('Stock Price')
+    ax.set_ylabel('P&L')
+    ax.legend()
+    ax.set_title(f'{position} {option_type} Option Payoff Diagram')
+    ax.grid(True)
+    return figure_to_png(fig)
+
+@instrumented()
+def render_payoff_png(stock_prices, payoff, position, option_type, color):
+    """
+    Render a payoff diagram to PNG bytes, reusing the cached image for identical inputs.
+
+    Parameters:
+    stock_prices (np.ndarray): Price grid
+    payoff (np.ndarray): Payoff of the position over the grid
+    position (str): 'Long' or 'Short', used in the legend and title
+    option_type (str): 'Call' or 'Put'; put diagrams get more vertical room
+    color (str): Matplotlib color of the payoff line
+
+    Returns:
+    bytes: The PNG image
+    """
+    stock_prices, payoff = np.asarray(stock_prices), np.asarray(payoff)
+    return cached_png("payoff", (stock_prices, payoff, position, option_type, color),
+                      lambda: _draw_payoff_png(stock_prices, payoff, position, option_type, color))
+
+def _draw_strategy_png(stock_prices, pnl, break_evens):
+    fig, ax = new_figure()
+    ax.spines['bottom'].set_position('zero')
+    ax.plot(stock_prices, pnl, label='Strategy', color='purple')
+    ax.fill_between(stock_prices, pnl, 0, where=pnl > 0, color='g', alpha=0.2)
+    ax.fill_between(stock_prices, pnl, 0, where=pnl < 0, color='r', alpha=0.2)
+    for break_even in break_evens:
+        ax.axvline(break_even, color='grey', linestyle='--', linewidth=0.8)
+
+    ax.set_xlabel('Stock Price')
+    ax.set_ylabel('P&L')
+    ax.legend()
+    ax.set_title('Strategy Payoff Diagram')
+    ax.grid(True)
+    return figure_to_png(fig)
+
+@instrumented()
+def render_strategy_png(stock_prices, pnl, break_evens):
+    """
+    Render the aggregate P&L of a multi-leg strategy to PNG bytes, marking the break-evens.
+
+    Parameters:
+    stock_prices (np.ndarray): Price grid
+    pnl (np.ndarray): Aggregate P&L over the grid
+    break_evens (np.ndarray): Break-even prices
+
+    Returns:
+    bytes: The PNG image
+    """
+    stock_prices, pnl, break_evens = np.asarray(stock_prices), np.asarray(pnl), np.asarray(break_evens)
+    return cached_png("strategy", (stock_prices, pnl, break_evens),
+                      lambda: _draw_strategy_png(stock_prices, pnl, break_evens))
@@ -0,0 +1,47 @@
+import io
+
+from utils.cache import LRUCache
+
+# Rendered PNGs keyed by a hash of the plotted arrays and labels
+render_cache = LRUCache(maxsize=64, decimals=6)
+
+def new_figure(figsize=None):
+    """
+    Create a figure that is not registered with pyplot.
+
+    Figures created this way are freed as soon as they go out of scope, so a long-lived
+    server never accumulates open pyplot figures.
+
+    Returns:
+    tuple: (fig, ax)
+    """
+    # Imported on first draw so importing this module does not load matplotlib
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+def figure_to_png(fig, dpi=100):
+    """
+    Render a figure to PNG bytes.
+
+    Returns:
+    bytes: The PNG image
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi)
+    return buffer.getvalue()
+
+def cached_png(name, inputs, draw):
+    """
+    Return the PNG for name and inputs from the render cache, drawing it on a miss.
+
+    Parameters:
+    name (str): Plot kind, part of the cache key
+    inputs (tuple): Arrays and labels the plot depends on
+    draw (callable): Zero-argument function returning the PNG bytes
+
+    Returns:
+    bytes: The PNG image
+    """
+    return render_cache.get_or_compute(render_cache.make_key(name, *inputs), draw)
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from matplot.heatmap_plotting import render_heatmap_png
+from matplot.payoff_plotting import long_call_payoff, render_payoff_png
+from matplot.rendering import render_cache
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_heatmap_png_is_cached_on_inputs():
+    prices = np.arange(12.0).reshape(3, 4)
+    spots, vols = np.linspace(90, 110, 4), np.linspace(0.1, 0.3, 3)
+    hits = render_cache.stats()["hits"]
+    png = render_heatmap_png(prices, spots, vols, "Call")
+    assert png.startswith(PNG_SIGNATURE)
+    assert render_heatmap_png(prices.copy(), spots, vols, "Call") is png
+    assert render_cache.stats()["hits"] == hits + 1
+    assert render_heatmap_png(prices, spots, vols, "Put") is not png
+
+def test_payoff_png_does_not_register_pyplot_figures():
+    stock_prices = np.linspace(50, 150, 101)
+    png = render_payoff_png(stock_prices, long_call_payoff(stock_prices, 100, 5), "Long", "Call", "green")
+    assert png.startswith(PNG_SIGNATURE)
+
+    import matplotlib.pyplot as plt
+    assert plt.get_fignums() == []
+
+def test_rendering_does_not_load_the_pricing_models():
+    probe = "import sys, matplot.rendering; print(sorted(m for m in sys.modules if m.startswith('models')))"
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
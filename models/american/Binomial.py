@@ -1,8 +1,341 @@
+import time
+from functools import lru_cache
+
 import numpy as np
 
+from models.european.BlackScholes import black_scholes_prices
+from utils.instrumentation import instrumented
+
+# Upper bound on lattice nodes (contracts x nodes) held in memory by one batch sweep
+_MAX_BATCH_NODES = 2_000_000
+
+def _batch_backward_induction(S, K, T, r, sigma, phi, N, greeks=False):
+    """
+    Run CRR backward induction for a block of contracts that share N.
+
+    Every array argument is 1-D with one entry per contract; phi is +1 for calls and
+    -1 for puts so calls and puts can share one sweep. With greeks, the tree delta and
+    gamma are read off steps 1 and 2 exactly as BinomialLattice.price does.
+
+    Returns:
+    np.ndarray: The option price of each contract, or (prices, deltas, gammas) with greeks
+    """
+    dt = T / N
+    vol_sqrt_dt = sigma * np.sqrt(dt)
+    u = np.exp(vol_sqrt_dt)
+    d = 1 / u
+    p = (np.exp(r * dt) - d) / (u - d)
+    discount = np.exp(-r * dt)
+    up_weight = discount * p
+    down_weight = discount * (1 - p)
+
+    # The lattice is stored node-major (nodes x contracts) so every tree level is one
+    # contiguous block. Exercise value at node (i, j) of contract m lives at [N - i + 2j, m]
+    exercise_values = S * np.exp(np.arange(-N, N + 1)[:, None] * vol_sqrt_dt)
+    exercise_values -= K
+    exercise_values *= phi
+
+    option_values = np.maximum(exercise_values[::2], 0)
+    scratch = np.empty((N, len(S)))
+    step_values = {N: option_values.copy()} if greeks and N <= 2 else {}
+    for i in range(N - 1, -1, -1):
+        current = option_values[:i + 1]
+        np.multiply(option_values[1:i + 2], up_weight, out=scratch[:i + 1])
+        np.multiply(current, down_weight, out=current)
+        np.add(current, scratch[:i + 1], out=current)
+        np.maximum(current, exercise_values[N - i:N + i + 1:2], out=current)
+        if greeks and i in (1, 2):
+            step_values[i] = current.copy()
+    if not greeks:
+        return option_values[0]
+
+    v1 = step_values[1]
+    delta = (v1[1] - v1[0]) / (S * (u - d))
+    gamma = np.full(len(S), np.nan)
+    if 2 in step_values:
+        v2 = step_values[2]
+        upper_delta = (v2[2] - v2[1]) / (S * (u * u - 1))
+        lower_delta = (v2[1] - v2[0]) / (S * (1 - d * d))
+        gamma = (upper_delta - lower_delta) / (0.5 * S * (u * u - d * d))
+    return option_values[0], delta, gamma
+
+@instrumented()
+def binomial_american_batch(S, K, T, r, sigma, N, option_type, greeks=False):
+    """
+    Price a book of American options with one tree sweep per group of contracts sharing N.
+
+    Inputs broadcast against each other. Contracts with the same number of steps are
+    priced together over a 2-D (nodes x contracts) lattice, so the Python loop over time
+    steps is paid once per group instead of once per contract.
+
+    Parameters:
+    S (float or np.ndarray): Current stock price(s)
+    K (float or np.ndarray): Strike price(s)
+    T (float or np.ndarray): Time(s) to maturity (in years)
+    r (float or np.ndarray): Risk-free interest rate(s)
+    sigma (float or np.ndarray): Volatility(ies) of the stock
+    N (int or np.ndarray): Number(s) of steps in the binomial tree
+    option_type (str or np.ndarray): 'call' or 'put', per contract or for the whole book
+    greeks (bool): Also return the tree delta and gamma of every contract
+
+    Returns:
+    np.ndarray: The American option prices with the broadcast shape of the inputs, or
+                (prices, deltas, gammas) with greeks
+    """
+    S, K, T, r, sigma, N, option_type = np.broadcast_arrays(
+        np.asarray(S, dtype=float), np.asarray(K, dtype=float), np.asarray(T, dtype=float),
+        np.asarray(r, dtype=float), np.asarray(sigma, dtype=float), np.asarray(N).astype(int),
+        np.asarray(option_type))
+    shape = S.shape
+    S, K, T, r, sigma, N = (a.ravel() for a in (S, K, T, r, sigma, N))
+    phi = np.where(option_type.ravel() == 'call', 1.0, -1.0)
+
+    results = np.empty((3 if greeks else 1, S.size))
+    for steps in np.unique(N):
+        steps = int(steps)
+        group = np.flatnonzero(N == steps)
+        chunk = max(1, _MAX_BATCH_NODES // (2 * steps + 1))
+        for start in range(0, len(group), chunk):
+            idx = group[start:start + chunk]
+            results[:, idx] = _batch_backward_induction(S[idx], K[idx], T[idx], r[idx], sigma[idx], phi[idx], steps, greeks)
+    if greeks:
+        return tuple(values.reshape(shape) for values in results)
+    return results[0].reshape(shape)
+
+class BinomialLattice:
+    def __init__(self, T, r, sigma, N):
+        """
+        Precompute everything in a CRR tree that does not depend on the spot or the strike.
+
+        u, d, p, the discount factor and the u**k ladder depend only on (T, r, sigma, N),
+        so one lattice can be reused for any number of spots and strikes: a spot move then
+        costs one scaling of the ladder plus the backward induction.
+
+        Parameters:
+        T (float): Time to maturity (in years)
+        r (float): Risk-free interest rate
+        sigma (float): Volatility of the stock
+        N (int): Number of steps in the binomial tree
+        """
+        self.steps = N
+        dt = T / N
+        self.u = np.exp(sigma * np.sqrt(dt))
+        self.d = 1 / self.u
+        p = (np.exp(r * dt) - self.d) / (self.u - self.d)
+        discount = np.exp(-r * dt)
+        self.up_weight = discount * p
+        self.down_weight = discount * (1 - p)
+        # Node (i, j) has price S * growth[N - i + 2j]
+        self.growth = np.exp(sigma * np.sqrt(dt) * np.arange(-N, N + 1))
+        self.growth.setflags(write=False)
+
+    @instrumented()
+    def price(self, S, K, option_type):
+        """
+        Price an American option on this lattice, with delta and gamma from the first nodes.
+
+        The option values at steps 1 and 2 are produced by the induction anyway, so the
+        tree delta and gamma come at no extra cost. Option values are updated in place in
+        one buffer, giving O(N) memory and no per-step allocations.
+
+        Parameters:
+        S (float): Current stock price
+        K (float): Strike price
+        option_type (str): 'call' or 'put'
+
+        Returns:
+        tuple: (option_price, delta, gamma); gamma is NaN for a one-step tree
+        """
+        N = self.steps
+        exercise_values = S * self.growth
+        if option_type == 'call':
+            exercise_values -= K
+        else:
+            np.subtract(K, exercise_values, out=exercise_values)
+
+        option_values = np.maximum(exercise_values[::2], 0)
+        scratch = np.empty(N)
+        # Keep the option values at steps 1 and 2 (the terminal payoffs if N is that small)
+        step_values = {N: option_values.copy()} if N <= 2 else {}
+        for i in range(N - 1, -1, -1):
+            current = option_values[:i + 1]
+            np.multiply(option_values[1:i + 2], self.up_weight, out=scratch[:i + 1])
+            np.multiply(current, self.down_weight, out=current)
+            np.add(current, scratch[:i + 1], out=current)
+            np.maximum(current, exercise_values[N - i:N + i + 1:2], out=current)
+            if i in (1, 2):
+                step_values[i] = current.copy()
+
+        u, d = self.u, self.d
+        v1 = step_values[1]
+        delta = (v1[1] - v1[0]) / (S * (u - d))
+        gamma = np.nan
+        if 2 in step_values:
+            v2 = step_values[2]
+            upper_delta = (v2[2] - v2[1]) / (S * (u * u - 1))
+            lower_delta = (v2[1] - v2[0]) / (S * (1 - d * d))
+            gamma = (upper_delta - lower_delta) / (0.5 * S * (u * u - d * d))
+        return option_values[0], delta, gamma
+
+@lru_cache(maxsize=128)
+def get_lattice(T, r, sigma, N):
+    """
+    Return a cached BinomialLattice for (T, r, sigma, N), building it on first use.
+
+    Returns:
+    BinomialLattice: The shared lattice
+    """
+    return BinomialLattice(T, r, sigma, int(N))
+
+LATTICE_METHODS = ('crr', 'leisen-reimer', 'trinomial', 'bbs', 'richardson')
+
+def _recombining_induction(S, K, u, d, up_weight, down_weight, phi, option_values):
+    """
+    Step back from the level held in option_values to the root of a recombining binomial tree.
+
+    Node (i, j) has price S * d**i * (u/d)**j, so trees with u * d != 1 (Leisen-Reimer)
+    are handled too. Values are updated in place.
+
+    Returns:
+    float: The option value at the root
+    """
+    top = len(option_values) - 1
+    ratio_powers = (u / d) ** np.arange(top + 1)
+    scratch = np.empty(max(top, 1))
+    exercise = np.empty(max(top, 1))
+    for i in range(top - 1, -1, -1):
+        current = option_values[:i + 1]
+        np.multiply(option_values[1:i + 2], up_weight, out=scratch[:i + 1])
+        np.multiply(current, down_weight, out=current)
+        np.add(current, scratch[:i + 1], out=current)
+        np.multiply(ratio_powers[:i + 1], S * d**i, out=exercise[:i + 1])
+        exercise[:i + 1] -= K
+        exercise[:i + 1] *= phi
+        np.maximum(current, exercise[:i + 1], out=current)
+    return option_values[0]
+
+def _peizer_pratt(z, N):
+    # Peizer-Pratt method 2 inversion of the normal distribution onto a binomial one
+    return 0.5 + np.sign(z) * 0.5 * np.sqrt(1 - np.exp(-(z / (N + 1 / 3 + 0.1 / (N + 1)))**2 * (N + 1 / 6)))
+
+def _leisen_reimer_price(S, K, T, r, sigma, N, phi):
+    # Leisen-Reimer trees need an odd number of steps
+    N = N + 1 - N % 2
+    dt = T / N
+    vol_sqrt_t = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    p = _peizer_pratt(d2, N)
+    growth = np.exp(r * dt)
+    u = growth * _peizer_pratt(d1, N) / p
+    d = (growth - p * u) / (1 - p)
+    discount = 1 / growth
+
+    terminal = S * d**N * (u / d) ** np.arange(N + 1)
+    option_values = np.maximum(phi * (terminal - K), 0)
+    return _recombining_induction(S, K, u, d, discount * p, discount * (1 - p), phi, option_values)
+
+def _bbs_price(S, K, T, r, sigma, N, phi):
+    # Binomial Black-Scholes: the last step is replaced by the closed-form European value
+    dt = T / N
+    u = np.exp(sigma * np.sqrt(dt))
+    d = 1 / u
+    p = (np.exp(r * dt) - d) / (u - d)
+    discount = np.exp(-r * dt)
+
+    prices = S * d**(N - 1) * (u / d) ** np.arange(N)
+    european = black_scholes_prices(prices, K, dt, r, sigma)[0 if phi > 0 else 1]
+    option_values = np.maximum(european, phi * (prices - K))
+    return _recombining_induction(S, K, u, d, discount * p, discount * (1 - p), phi, option_values)
+
+def _trinomial_price(S, K, T, r, sigma, N, phi):
+    # https://en.wikipedia.org/wiki/Trinomial_tree
+    dt = T / N
+    half_step = sigma * np.sqrt(dt / 2)
+    denominator = np.exp(half_step) - np.exp(-half_step)
+    pu = ((np.exp(r * dt / 2) - np.exp(-half_step)) / denominator)**2
+    pd = ((np.exp(half_step) - np.exp(r * dt / 2)) / denominator)**2
+    discount = np.exp(-r * dt)
+    up_weight, middle_weight, down_weight = discount * pu, discount * (1 - pu - pd), discount * pd
+
+    # Node k of step i (k = -i..i) has price S * u**k and lives at index N + k
+    exercise_values = phi * (S * np.exp(2 * half_step * np.arange(-N, N + 1)) - K)
+    option_values = np.maximum(exercise_values, 0)
+    scratch = np.empty(2 * N)
+    for i in range(N - 1, -1, -1):
+        width = 2 * i + 1
+        current = option_values[:width]
+        np.multiply(option_values[1:width + 1], middle_weight, out=scratch[:width])
+        scratch[:width] += up_weight * option_values[2:width + 2]
+        np.multiply(current, down_weight, out=current)
+        np.add(current, scratch[:width], out=current)
+        np.maximum(current, exercise_values[N - i:N + i + 1], out=current)
+    return option_values[0]
+
+@instrumented()
+def lattice_price(S, K, T, r, sigma, N, option_type, method='crr'):
+    """
+    Price an American option on one of the supported lattices.
+
+    'crr' is the plain Cox-Ross-Rubinstein tree, 'leisen-reimer' matches the binomial
+    distribution to d1/d2 (odd N), 'trinomial' adds a middle branch, 'bbs' replaces the
+    last step with Black-Scholes values, and 'richardson' extrapolates two BBS trees as
+    2 * BBS(N) - BBS(N / 2). All but 'crr' converge smoothly, so far fewer steps are
+    needed for the same accuracy.
+
+    Parameters:
+    S (float): Current stock price
+    K (float): Strike price
+    T (float): Time to maturity (in years)
+    r (float): Risk-free interest rate
+    sigma (float): Volatility of the stock
+    N (int): Number of steps
+    option_type (str): 'call' or 'put'
+    method (str): One of LATTICE_METHODS
+
+    Returns:
+    float: The American option price
+    """
+    N = int(N)
+    phi = 1.0 if option_type == 'call' else -1.0
+    if method == 'crr':
+        return get_lattice(T, r, sigma, N).price(S, K, option_type)[0]
+    if method == 'leisen-reimer':
+        return _leisen_reimer_price(S, K, T, r, sigma, N, phi)
+    if method == 'trinomial':
+        return _trinomial_price(S, K, T, r, sigma, N, phi)
+    if method == 'bbs':
+        return _bbs_price(S, K, T, r, sigma, N, phi)
+    if method == 'richardson':
+        return 2 * _bbs_price(S, K, T, r, sigma, N, phi) - _bbs_price(S, K, T, r, sigma, max(N // 2, 1), phi)
+    raise ValueError(f"method must be one of {LATTICE_METHODS}, got {method!r}")
+
+def convergence_report(S, K, T, r, sigma, option_type='put', steps=(25, 50, 100, 200, 400, 800),
+                       methods=LATTICE_METHODS, reference_steps=10001):
+    """
+    Tabulate price versus N for each lattice method against a high-resolution reference.
+
+    The reference is a Leisen-Reimer tree with reference_steps steps.
+
+    Returns:
+    pd.DataFrame: One row per (method, steps) with price, absolute error and seconds
+    """
+    import pandas as pd
+
+    reference = lattice_price(S, K, T, r, sigma, reference_steps, option_type, 'leisen-reimer')
+    rows = []
+    for method in methods:
+        for N in steps:
+            start = time.perf_counter()
+            price = lattice_price(S, K, T, r, sigma, N, option_type, method)
+            elapsed = time.perf_counter() - start
+            rows.append({"method": method, "steps": N, "price": price,
+                         "error": abs(price - reference), "seconds": elapsed})
+    return pd.DataFrame(rows)
+
 # https://www.investopedia.com/terms/b/binomialoptionpricing.asp
 class BinomialAmericanOption:
-    def __init__(self, S, K, T, r, sigma, N):
+    def __init__(self, S, K, T, r, sigma, N, fast=True, method='crr'):
         """
         Initialize the Binomial Option pricing model parameters.
 
@@ -13,13 +346,19 @@ class BinomialAmericanOption:
         r (float): Risk-free interest rate
         sigma (float): Volatility of the stock
         N (int): Number of steps in the binomial tree
+        fast (bool): Use the allocation-free backward induction (default True)
+        method (str): Lattice to use, one of LATTICE_METHODS (default 'crr')
         """
+        if method not in LATTICE_METHODS:
+            raise ValueError(f"method must be one of {LATTICE_METHODS}, got {method!r}")
         self.curr_price = S
         self.strike_price = K
         self.time_to_maturity = T
         self.riskfree_interest_rate = r
         self.volatility = sigma
         self.steps = N
+        self.fast = fast
+        self.method = method
 
     def _initialize_parameters(self):
         """
@@ -68,6 +407,7 @@ class BinomialAmericanOption:
                 option_values = np.maximum(option_values, K - asset_prices)
         return option_values[0]
 
+    @instrumented()
     def call_price(self):
         """
         Calculate the American call option price using the binomial model.
@@ -76,10 +416,13 @@ class BinomialAmericanOption:
         float: The American call option price
         """
         S, K, T, r, sigma, N, dt, u, d, p, discount = self._initialize_parameters()
+        if self.method != 'crr' or self.fast:
+            return lattice_price(S, K, T, r, sigma, N, 'call', self.method)
         asset_prices = S * d**np.arange(N, -1, -1) * u**np.arange(0, N + 1, 1)
         option_values = np.maximum(0, asset_prices - K)
         return self.calculate_option_value(option_values, asset_prices, p, discount, N, K, 'call')
 
+    @instrumented()
     def put_price(self):
         """
         Calculate the American put option price using the binomial model.
@@ -88,6 +431,33 @@ class BinomialAmericanOption:
         float: The American put option price
         """
         S, K, T, r, sigma, N, dt, u, d, p, discount = self._initialize_parameters()
+        if self.method != 'crr' or self.fast:
+            return lattice_price(S, K, T, r, sigma, N, 'put', self.method)
         asset_prices = S * d**np.arange(N, -1, -1) * u**np.arange(0, N + 1, 1)
         option_values = np.maximum(0, K - asset_prices)
         return self.calculate_option_value(option_values, asset_prices, p, discount, N, K, 'put')
+
+    def price_with_greeks(self, option_type):
+        """
+        Calculate the American option price with its delta and gamma on the model's lattice.
+
+        CRR reads delta and gamma off the first nodes of the tree. The other lattices
+        are repriced at spots one trinomial node apart (a factor exp(sigma * sqrt(2 * T / N))
+        either side), so the differences step over the tree's oscillations instead of
+        sampling them.
+
+        Parameters:
+        option_type (str): 'call' or 'put'
+
+        Returns:
+        tuple: (option_price, delta, gamma)
+        """
+        S, K, T, r, sigma, N = self.curr_price, self.strike_price, self.time_to_maturity, self.riskfree_interest_rate, self.volatility, self.steps
+        if self.method == 'crr':
+            return get_lattice(T, r, sigma, int(N)).price(S, K, option_type)
+        u = np.exp(sigma * np.sqrt(2 * T / N))
+        S_down, S_up = S / u, S * u
+        down, price, up = (lattice_price(spot, K, T, r, sigma, N, option_type, self.method) for spot in (S_down, S, S_up))
+        delta = (up - down) / (S_up - S_down)
+        gamma = 2 * ((up - price) / (S_up - S) - (price - down) / (S - S_down)) / (S_up - S_down)
+        return price, delta, gamma
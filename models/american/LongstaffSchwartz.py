@@ -0,0 +1,150 @@
+import numpy as np
+
+from models.european.BlackScholes import black_scholes_prices
+from models.european.MonteCarlo import _PayoffSums, simulate_paths
+from utils.instrumentation import instrumented
+
+# https://people.math.ethz.ch/~hjfurrer/teaching/LongstaffSchwartzAmericanOptionsLeastSquareMonteCarlo.pdf
+class LongstaffSchwartzAmericanOption:
+    def __init__(self, S, K, T, r, sigma, N, paths=100000, training_paths=None, basis_degree=3, seed=None):
+        """
+        Initialize the Longstaff-Schwartz least-squares Monte Carlo model parameters.
+
+        The exercise rule is fitted by regression on a training set of paths and then
+        applied to an independent set of pricing paths, which are simulated in chunks.
+
+        Parameters:
+        S (float): Current stock price
+        K (float): Strike price
+        T (float): Time to maturity (in years)
+        r (float): Risk-free interest rate
+        sigma (float): Volatility of the stock
+        N (int): Number of exercise dates (time steps) up to maturity
+        paths (int): Number of pricing paths
+        training_paths (int): Number of paths used to fit the exercise rule
+        basis_degree (int): Degree of the polynomial regression basis
+        seed (int or np.random.Generator): Seed or generator for reproducible draws
+        """
+        self.curr_price = S
+        self.strike_price = K
+        self.time_to_maturity = T
+        self.riskfree_interest_rate = r
+        self.volatility = sigma
+        self.steps = int(N)
+        self.paths = int(paths)
+        self.training_paths = int(training_paths or min(self.paths, 50000))
+        self.basis_degree = basis_degree
+        self.rng = np.random.default_rng(seed)
+
+    def _intrinsic_value(self, prices, option_type):
+        if option_type == 'call':
+            return np.maximum(prices - self.strike_price, 0)
+        return np.maximum(self.strike_price - prices, 0)
+
+    def _basis(self, prices):
+        # Polynomials in moneyness keep the regression well conditioned
+        return np.vander(prices / self.strike_price, self.basis_degree + 1)
+
+    def _continuation_value(self, prices, t, coefficients, option_type):
+        """
+        Estimate the continuation value at exercise date t (0-based) for the given prices.
+
+        The regression estimate is floored at the closed-form European value of the
+        remaining option, which the holder can always lock in by not exercising early.
+        This removes most of the spurious early exercise caused by regression noise.
+
+        Returns:
+        np.ndarray: Continuation values
+        """
+        remaining = self.time_to_maturity * (1 - (t + 1) / self.steps)
+        european = black_scholes_prices(prices, self.strike_price, remaining, self.riskfree_interest_rate, self.volatility)[option_type == 'put']
+        return np.maximum(self._basis(prices) @ coefficients[t], european)
+
+    def _fit_exercise_rule(self, option_type):
+        """
+        Regress discounted continuation values on the basis at every exercise date.
+
+        Parameters:
+        option_type (str): 'call' or 'put'
+
+        Returns:
+        np.ndarray: Regression coefficients of shape (N - 1, basis_degree + 1)
+        """
+        N = self.steps
+        discount = np.exp(-self.riskfree_interest_rate * self.time_to_maturity / N)
+        paths = next(simulate_paths(self.curr_price, self.time_to_maturity, self.riskfree_interest_rate,
+                                    self.volatility, N, self.training_paths, self.rng, self.training_paths))
+
+        coefficients = np.zeros((N - 1, self.basis_degree + 1))
+        cashflows = self._intrinsic_value(paths[:, -1], option_type)
+        for t in range(N - 2, -1, -1):
+            cashflows *= discount
+            exercise = self._intrinsic_value(paths[:, t], option_type)
+            in_the_money = exercise > 0
+            if np.count_nonzero(in_the_money) <= self.basis_degree:
+                continue
+            basis = self._basis(paths[in_the_money, t])
+            coefficients[t] = np.linalg.lstsq(basis, cashflows[in_the_money], rcond=None)[0]
+            continuation = self._continuation_value(paths[in_the_money, t], t, coefficients, option_type)
+            exercised = np.flatnonzero(in_the_money)[exercise[in_the_money] > continuation]
+            cashflows[exercised] = exercise[exercised]
+        return coefficients
+
+    @instrumented()
+    def price_with_error(self, option_type):
+        """
+        Calculate the American option price and its standard error.
+
+        The European payoff on the same paths, whose closed-form Black-Scholes price is
+        known, is used as a control variate.
+
+        Parameters:
+        option_type (str): 'call' or 'put'
+
+        Returns:
+        tuple: (option_price, standard_error)
+        """
+        N = self.steps
+        T = self.time_to_maturity
+        r = self.riskfree_interest_rate
+        coefficients = self._fit_exercise_rule(option_type)
+        discount_factors = np.exp(-r * T * np.arange(1, N + 1) / N)
+        european_price = black_scholes_prices(self.curr_price, self.strike_price, T, r, self.volatility)[option_type == 'put']
+
+        sums = _PayoffSums()
+        for paths in simulate_paths(self.curr_price, T, r, self.volatility, N, self.paths, self.rng):
+            payoff = np.zeros(len(paths))
+            alive = np.ones(len(paths), dtype=bool)
+            for t in range(N - 1):
+                exercise = self._intrinsic_value(paths[:, t], option_type)
+                candidates = np.flatnonzero(alive & (exercise > 0))
+                continuation = self._continuation_value(paths[candidates, t], t, coefficients, option_type)
+                exercised = candidates[exercise[candidates] > continuation]
+                payoff[exercised] = discount_factors[t] * exercise[exercised]
+                alive[exercised] = False
+            payoff[alive] = discount_factors[-1] * self._intrinsic_value(paths[alive, -1], option_type)
+
+            european_payoff = discount_factors[-1] * self._intrinsic_value(paths[:, -1], option_type)
+            sums.add(payoff, european_payoff - european_price)
+
+        price, standard_error = sums.estimate(use_control=True)
+        # Exercising immediately is always available to the holder
+        return max(price, self._intrinsic_value(self.curr_price, option_type)), standard_error
+
+    def call_price(self):
+        """
+        Calculate the American call option price using least-squares Monte Carlo.
+
+        Returns:
+        float: The American call option price
+        """
+        return self.price_with_error('call')[0]
+
+    def put_price(self):
+        """
+        Calculate the American put option price using least-squares Monte Carlo.
+
+        Returns:
+        float: The American put option price
+        """
+        return self.price_with_error('put')[0]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from models.american.Binomial import (LATTICE_METHODS, BinomialAmericanOption, BinomialLattice, binomial_american_batch,
+                                      convergence_report, get_lattice, lattice_price)
+from models.european.BlackScholes import black_scholes_greeks, black_scholes_prices
+
+CONTRACTS = [(100, 100, 1.0, 0.05, 0.2), (90, 100, 0.5, 0.03, 0.35), (120, 100, 2.0, 0.08, 0.15)]
+
+@pytest.mark.parametrize("S, K, T, r, sigma", CONTRACTS)
+@pytest.mark.parametrize("N", [1, 2, 50, 201])
+def test_fast_induction_matches_the_original_loop(S, K, T, r, sigma, N):
+    fast = BinomialAmericanOption(S, K, T, r, sigma, N)
+    original = BinomialAmericanOption(S, K, T, r, sigma, N, fast=False)
+    assert fast.call_price() == pytest.approx(original.call_price(), rel=1e-12, abs=1e-12)
+    assert fast.put_price() == pytest.approx(original.put_price(), rel=1e-12, abs=1e-12)
+
+def test_american_prices_respect_european_bounds():
+    S, K, T, r, sigma = CONTRACTS[0]
+    model = BinomialAmericanOption(S, K, T, r, sigma, 500)
+    call, put = black_scholes_prices(S, K, T, r, sigma)
+    # Without dividends an American call is worth the European one; the put is worth more
+    assert model.call_price() == pytest.approx(call, abs=0.02)
+    assert model.put_price() > put
+    assert model.put_price() >= K - S
+
+def test_batch_matches_single_contracts():
+    S, K, T, r, sigma = (np.array(column, dtype=float) for column in zip(*CONTRACTS))
+    N = np.array([50, 51, 200])
+    for option_type in ('call', 'put'):
+        batch = binomial_american_batch(S, K, T, r, sigma, N, option_type)
+        single = [getattr(BinomialAmericanOption(*contract, n), f"{option_type}_price")() for contract, n in zip(CONTRACTS, N)]
+        np.testing.assert_allclose(batch, single, rtol=1e-12)
+
+def test_batch_mixes_calls_and_puts_and_broadcasts():
+    strikes = np.linspace(80, 120, 9)
+    option_types = np.where(np.arange(9) % 2, 'call', 'put')
+    mixed = binomial_american_batch(100, strikes, 1.0, 0.05, 0.2, 100, option_types)
+    calls = binomial_american_batch(100, strikes, 1.0, 0.05, 0.2, 100, 'call')
+    puts = binomial_american_batch(100, strikes, 1.0, 0.05, 0.2, 100, 'put')
+    np.testing.assert_array_equal(mixed, np.where(option_types == 'call', calls, puts))
+    assert binomial_american_batch(100, strikes[None, :], 1.0, 0.05, np.array([0.1, 0.2])[:, None], 100, 'put').shape == (2, 9)
+
+def test_batch_greeks_match_the_lattice():
+    prices, deltas, gammas = binomial_american_batch(np.array([90.0, 110.0]), 100, 1.0, 0.05, 0.2, 100, 'put', greeks=True)
+    for i, S in enumerate((90.0, 110.0)):
+        price, delta, gamma = BinomialAmericanOption(S, 100, 1.0, 0.05, 0.2, 100).price_with_greeks('put')
+        assert (prices[i], deltas[i], gammas[i]) == pytest.approx((price, delta, gamma), rel=1e-10)
+
+def test_lattice_is_reused_across_spots_and_strikes():
+    get_lattice.cache_clear()
+    lattice = get_lattice(1.0, 0.05, 0.2, 100)
+    for S in (95.0, 100.0, 105.0):
+        for K in (90.0, 110.0):
+            assert lattice.price(S, K, 'put')[0] == pytest.approx(BinomialAmericanOption(S, K, 1.0, 0.05, 0.2, 100, fast=False).put_price(), rel=1e-12)
+            BinomialAmericanOption(S, K, 1.0, 0.05, 0.2, 100).call_price()
+    assert get_lattice.cache_info().misses == 1
+    # Pricing must not modify the shared ladder
+    np.testing.assert_array_equal(lattice.growth, BinomialLattice(1.0, 0.05, 0.2, 100).growth)
+
+def test_tree_greeks_match_black_scholes_for_calls():
+    _, delta, gamma = get_lattice(1.0, 0.05, 0.2, 2000).price(100.0, 100.0, 'call')
+    greeks = black_scholes_greeks(100.0, 100.0, 1.0, 0.05, 0.2)
+    assert delta == pytest.approx(greeks["call_delta"], abs=1e-3)
+    assert gamma == pytest.approx(greeks["gamma"], rel=1e-2)
+    assert np.isnan(get_lattice(1.0, 0.05, 0.2, 1).price(100.0, 100.0, 'call')[2])
+
+@pytest.mark.parametrize("option_type", ['call', 'put'])
+def test_lattice_methods_converge_to_the_reference(option_type):
+    S, K, T, r, sigma = 100.0, 105.0, 1.0, 0.05, 0.25
+    # Without dividends the American call is the European one; for the put, Richardson
+    # extrapolation on a deep tree agrees with CRR at 20,000 steps to about 1e-5
+    if option_type == 'call':
+        reference = black_scholes_prices(S, K, T, r, sigma)[0]
+    else:
+        reference = lattice_price(S, K, T, r, sigma, 4001, option_type, 'richardson')
+    for method in LATTICE_METHODS:
+        assert lattice_price(S, K, T, r, sigma, 801, option_type, method) == pytest.approx(reference, abs=2e-3), method
+    assert lattice_price(S, K, T, r, sigma, 201, option_type, 'richardson') == pytest.approx(reference, abs=1e-3)
+    if option_type == 'call':
+        # Leisen-Reimer converges at second order for European payoffs
+        assert lattice_price(S, K, T, r, sigma, 201, option_type, 'leisen-reimer') == pytest.approx(reference, abs=1e-4)
+
+def test_convergence_report_lists_every_method():
+    report = convergence_report(100, 100, 1.0, 0.05, 0.2, steps=(25, 101), reference_steps=1001)
+    assert len(report) == 2 * len(LATTICE_METHODS)
+    assert (report.groupby("method")["error"].last() <= report.groupby("method")["error"].first() + 1e-9).all()
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        BinomialAmericanOption(100, 100, 1.0, 0.05, 0.2, 50, method='jarrow-rudd')
+
+@pytest.mark.parametrize("method", LATTICE_METHODS)
+def test_greeks_use_the_chosen_lattice(method):
+    option = BinomialAmericanOption(100, 100, 1.0, 0.05, 0.2, 401, method=method)
+    price, delta, gamma = option.price_with_greeks('call')
+    assert price == lattice_price(100, 100, 1.0, 0.05, 0.2, 401, 'call', method)
+    # Without dividends the American call is the European one
+    greeks = black_scholes_greeks(100, 100, 1.0, 0.05, 0.2)
+    assert (delta, gamma) == pytest.approx((greeks["call_delta"], greeks["gamma"]), rel=1e-2)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from models.american.Binomial import lattice_price
+from models.american.LongstaffSchwartz import LongstaffSchwartzAmericanOption
+from models.european.BlackScholes import black_scholes_prices
+from models.european.MonteCarlo import simulate_paths
+
+S, K, T, r, sigma = 100.0, 105.0, 1.0, 0.05, 0.25
+
+def test_put_matches_the_binomial_tree():
+    price, error = LongstaffSchwartzAmericanOption(S, K, T, r, sigma, 50, paths=40_000, seed=0).price_with_error('put')
+    american = lattice_price(S, K, T, r, sigma, 4001, 'put', 'richardson')
+    european = black_scholes_prices(S, K, T, r, sigma)[1]
+    # 50 exercise dates price a Bermudan option, slightly below the American one
+    assert american - 0.1 < price < american + 4 * error
+    assert price > european
+    assert 0 < error < 0.05
+
+def test_call_without_dividends_is_european():
+    price, error = LongstaffSchwartzAmericanOption(S, K, T, r, sigma, 20, paths=20_000, seed=1).price_with_error('call')
+    assert price == pytest.approx(black_scholes_prices(S, K, T, r, sigma)[0], abs=4 * error + 1e-3)
+
+def test_seeded_runs_are_reproducible():
+    first = LongstaffSchwartzAmericanOption(S, K, T, r, sigma, 10, paths=5_000, seed=2).put_price()
+    assert LongstaffSchwartzAmericanOption(S, K, T, r, sigma, 10, paths=5_000, seed=2).put_price() == first
+
+def test_simulated_paths_come_in_bounded_chunks():
+    chunks = list(simulate_paths(S, T, r, sigma, 10, 2_500, np.random.default_rng(3), chunk_size=1_000))
+    assert [chunk.shape for chunk in chunks] == [(1_000, 10), (1_000, 10), (500, 10)]
+    terminal = np.concatenate([chunk[:, -1] for chunk in chunks])
+    # The discounted terminal price is a martingale
+    assert np.exp(-r * T) * terminal.mean() == pytest.approx(S, rel=0.02)
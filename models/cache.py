@@ -0,0 +1,63 @@
+from models.american.Binomial import BinomialAmericanOption
+from models.european.BlackScholes import BlackScholes
+from models.european.MonteCarlo import MonteCarlo
+from models.surface import price_surface
+from utils.cache import LRUCache
+
+# The LRU lives in utils so the renderers can use it without loading the pricing models
+PricingCache = LRUCache
+
+# Shared by every caller in the process, so it survives Streamlit reruns
+pricing_cache = PricingCache()
+
+def _compute_prices(model, S, K, T, r, sigma, N, seed):
+    if model == "Black-Scholes":
+        return BlackScholes(S, K, T, r, sigma).prices()
+    if model == "Binomial":
+        binomial = BinomialAmericanOption(S, K, T, r, sigma, N)
+        return binomial.call_price(), binomial.put_price()
+    if model == "Monte-Carlo":
+        return MonteCarlo(S, K, T, r, sigma, N, seed=seed).prices()
+    raise ValueError(f"Unknown pricing model {model!r}")
+
+def cached_prices(model, S, K, T, r, sigma, N=None, seed=None, cache=pricing_cache):
+    """
+    Calculate call and put prices for one contract through the pricing cache.
+
+    Unseeded Monte-Carlo runs are not reproducible, so they bypass the cache.
+
+    Parameters:
+    model (str): "Black-Scholes", "Binomial" or "Monte-Carlo"
+    S (float): Current stock price
+    K (float): Strike price
+    T (float): Time to maturity (in years)
+    r (float): Risk-free interest rate
+    sigma (float): Volatility of the stock
+    N (int): Tree steps (Binomial) or simulated paths (Monte-Carlo)
+    seed (int): Seed for the Monte-Carlo draws
+    cache (PricingCache): Cache to use
+
+    Returns:
+    tuple: (call_price, put_price)
+    """
+    if model == "Monte-Carlo" and seed is None:
+        return _compute_prices(model, S, K, T, r, sigma, N, seed)
+    key = cache.make_key(model, S, K, T, r, sigma, N, seed=seed)
+    return cache.get_or_compute(key, lambda: _compute_prices(model, S, K, T, r, sigma, N, seed))
+
+def cached_surface(model, spot_prices, volatilities, K, T, r, N=None, seed=None, cache=pricing_cache, incremental=None):
+    """
+    Calculate a call/put price surface through the pricing cache.
+
+    Takes the same arguments as price_surface, plus the cache to use. With an
+    IncrementalSurface, cache misses are priced through it, so only the rows and columns
+    that differ from its previous surface are recomputed.
+
+    Returns:
+    tuple: (call_prices, put_prices), read-only arrays
+    """
+    price = incremental.update if incremental is not None else price_surface
+    if model == "Monte-Carlo" and seed is None:
+        return price(model, spot_prices, volatilities, K, T, r, N, seed)
+    key = cache.make_key("surface:" + model, spot_prices, volatilities, K, T, r, N, seed=seed)
+    return cache.get_or_compute(key, lambda: price(model, spot_prices, volatilities, K, T, r, N, seed))
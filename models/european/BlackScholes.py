@@ -1,5 +1,93 @@
 import numpy as np
-from scipy.stats import norm
+from models.european.normal import ndtr
+
+from utils.instrumentation import instrumented
+
+def _d1_d2(S, K, T, r, sigma):
+    """
+    Calculate d1, d2 and the discount factor in one pass so callers can share them.
+
+    Returns:
+    tuple: (d1, d2, discount_factor)
+    """
+    vol_sqrt_t = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    discount_factor = np.exp(-r * T)
+    return d1, d2, discount_factor
+
+@instrumented()
+def black_scholes_prices(S, K, T, r, sigma):
+    """
+    Price European calls and puts for whole option chains in one vectorized call.
+
+    All inputs broadcast against each other with NumPy rules, so a chain of strikes
+    can be priced with scalar S, T, r, sigma and an array K (or any other mix).
+
+    Parameters:
+    S (float or np.ndarray): Current stock price(s)
+    K (float or np.ndarray): Strike price(s)
+    T (float or np.ndarray): Time(s) to maturity (in years)
+    r (float or np.ndarray): Risk-free interest rate(s)
+    sigma (float or np.ndarray): Volatility(ies) of the stock
+
+    Returns:
+    tuple: (call_prices, put_prices) with the broadcast shape of the inputs
+    """
+    S = np.asarray(S, dtype=float)
+    K = np.asarray(K, dtype=float)
+    d1, d2, discount_factor = _d1_d2(S, K, np.asarray(T, dtype=float), np.asarray(r, dtype=float), np.asarray(sigma, dtype=float))
+    discounted_strike = K * discount_factor
+    call_prices = S * ndtr(d1) - discounted_strike * ndtr(d2)
+    put_prices = discounted_strike * ndtr(-d2) - S * ndtr(-d1)
+    return call_prices, put_prices
+
+@instrumented()
+def black_scholes_greeks(S, K, T, r, sigma):
+    """
+    Calculate the analytic Black-Scholes Greeks for calls and puts in one vectorized pass.
+
+    d1, d2, pdf(d1) and the discount factor are computed once and shared by every Greek.
+    Inputs broadcast like black_scholes_prices. Theta is per year and vega/rho are per
+    unit change (1.00 = 100%) of volatility and rate.
+
+    Parameters:
+    S (float or np.ndarray): Current stock price(s)
+    K (float or np.ndarray): Strike price(s)
+    T (float or np.ndarray): Time(s) to maturity (in years)
+    r (float or np.ndarray): Risk-free interest rate(s)
+    sigma (float or np.ndarray): Volatility(ies) of the stock
+
+    Returns:
+    dict: Arrays keyed by 'call_delta', 'put_delta', 'gamma', 'vega',
+          'call_theta', 'put_theta', 'call_rho' and 'put_rho'
+    """
+    S = np.asarray(S, dtype=float)
+    K = np.asarray(K, dtype=float)
+    T = np.asarray(T, dtype=float)
+    r = np.asarray(r, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    d1, d2, discount_factor = _d1_d2(S, K, T, r, sigma)
+
+    sqrt_t = np.sqrt(T)
+    pdf_d1 = np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi)
+    cdf_d1 = ndtr(d1)
+    cdf_d2 = ndtr(d2)
+    cdf_minus_d2 = ndtr(-d2)
+    discounted_strike = K * discount_factor
+    s_pdf_d1 = S * pdf_d1
+    time_decay = -s_pdf_d1 * sigma / (2 * sqrt_t)
+
+    return {
+        "call_delta": cdf_d1,
+        "put_delta": cdf_d1 - 1,
+        "gamma": pdf_d1 / (S * sigma * sqrt_t),
+        "vega": s_pdf_d1 * sqrt_t,
+        "call_theta": time_decay - r * discounted_strike * cdf_d2,
+        "put_theta": time_decay + r * discounted_strike * cdf_minus_d2,
+        "call_rho": discounted_strike * T * cdf_d2,
+        "put_rho": -discounted_strike * T * cdf_minus_d2,
+    }
 
 # https://www.investopedia.com/terms/b/blackscholes.asp
 class BlackScholes:
@@ -27,8 +115,7 @@ class BlackScholes:
         Returns:
         float: The d1 value
         """
-        return (np.log(self.curr_price / self.strike_price) + 
-                (self.riskfree_interest_rate + 0.5 * self.volatility**2) * self.time_to_maturity) / (self.volatility * np.sqrt(self.time_to_maturity))
+        return _d1_d2(self.curr_price, self.strike_price, self.time_to_maturity, self.riskfree_interest_rate, self.volatility)[0]
     
     def d2(self):
         """
@@ -37,7 +124,7 @@ class BlackScholes:
         Returns:
         float: The d2 value
         """
-        return self.d1() - self.volatility * np.sqrt(self.time_to_maturity)
+        return _d1_d2(self.curr_price, self.strike_price, self.time_to_maturity, self.riskfree_interest_rate, self.volatility)[1]
     
     def call_price(self):
         """
@@ -46,11 +133,7 @@ class BlackScholes:
         Returns:
         float: The call option price
         """
-        d1 = self.d1()
-        d2 = self.d2()
-        call_price = (self.curr_price * norm.cdf(d1) - 
-                      self.strike_price * np.exp(-self.riskfree_interest_rate * self.time_to_maturity) * norm.cdf(d2))
-        return call_price
+        return self.prices()[0]
 
     def put_price(self):
         """
@@ -59,8 +142,22 @@ class BlackScholes:
         Returns:
         float: The put option price
         """
-        d1 = self.d1()
-        d2 = self.d2()
-        put_price = (self.strike_price * np.exp(-self.riskfree_interest_rate * self.time_to_maturity) * norm.cdf(-d2) - 
-                     self.curr_price * norm.cdf(-d1))
-        return put_price
+        return self.prices()[1]
+
+    def prices(self):
+        """
+        Calculate the call and put prices together, sharing d1 and d2 between them.
+
+        Returns:
+        tuple: (call_price, put_price)
+        """
+        return black_scholes_prices(self.curr_price, self.strike_price, self.time_to_maturity, self.riskfree_interest_rate, self.volatility)
+
+    def greeks(self):
+        """
+        Calculate delta, gamma, vega, theta and rho for the call and the put.
+
+        Returns:
+        dict: Greeks keyed as in black_scholes_greeks
+        """
+        return black_scholes_greeks(self.curr_price, self.strike_price, self.time_to_maturity, self.riskfree_interest_rate, self.volatility)
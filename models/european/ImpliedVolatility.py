@@ -0,0 +1,180 @@
+import numpy as np
+from models.european.normal import ndtr
+
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import _d1_d2
+from utils.instrumentation import instrumented
+
+# Volatility search range shared by the European and American solvers
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 10.0
+
+def _initial_guess(price, S, discounted_strike, T):
+    """
+    Rational-approximation starting point for the call volatility (Corrado-Miller).
+
+    Falls back to the at-the-money Brenner-Subrahmanyam estimate where the
+    approximation breaks down.
+
+    Returns:
+    np.ndarray: Initial volatility guesses
+    """
+    half_moneyness = (S - discounted_strike) / 2
+    excess = price - half_moneyness
+    root = np.sqrt(np.maximum(excess**2 - 4 * half_moneyness**2 / np.pi, 0))
+    guess = np.sqrt(2 * np.pi / T) / (S + discounted_strike) * (excess + root)
+    guess = np.where(np.isfinite(guess) & (guess > 0), guess, np.sqrt(2 * np.pi / T) * price / S)
+    return np.clip(guess, MIN_VOLATILITY, MAX_VOLATILITY)
+
+@instrumented()
+def implied_volatility(price, S, K, T, r, option_type='call', tol=1e-10, max_iter=50):
+    """
+    Invert Black-Scholes for the implied volatility of whole arrays of option prices.
+
+    Every quote is converted to its out-of-the-money side through put-call parity and
+    solved with a vectorized Halley iteration whose vega and volga reuse the same d1
+    and d2. Each element keeps a bracket [low, high] and any step that leaves it falls
+    back to bisection for that element alone. Converged elements drop out of the
+    iteration, so later passes only touch the hard quotes.
+
+    Parameters:
+    price (float or np.ndarray): Observed option price(s)
+    S (float or np.ndarray): Current stock price(s)
+    K (float or np.ndarray): Strike price(s)
+    T (float or np.ndarray): Time(s) to maturity (in years)
+    r (float or np.ndarray): Risk-free interest rate(s)
+    option_type (str or np.ndarray): 'call' or 'put', per quote or for all of them
+    tol (float): Absolute price tolerance
+    max_iter (int): Maximum number of iterations
+
+    Returns:
+    np.ndarray: Implied volatilities, NaN where the price is outside the no-arbitrage bounds
+                (including deep in-the-money quotes with no time value left after rounding),
+                needs more than MAX_VOLATILITY, or did not converge within max_iter
+    """
+    price, S, K, T, r, option_type = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(S, dtype=float), np.asarray(K, dtype=float),
+        np.asarray(T, dtype=float), np.asarray(r, dtype=float), np.asarray(option_type))
+    shape = price.shape
+    price, S, K, T, r = (a.ravel() for a in (price, S, K, T, r))
+    is_call = option_type.ravel() == 'call'
+    discounted_strike = K * np.exp(-r * T)
+
+    # Solve on the out-of-the-money side: phi = +1 prices a call, -1 a put
+    call_price = np.where(is_call, price, price + S - discounted_strike)
+    phi = np.where(S < discounted_strike, 1.0, -1.0)
+    target = np.where(phi > 0, call_price, call_price - S + discounted_strike)
+
+    upper_bound = np.where(phi > 0, S, discounted_strike)
+    valid = (target >= 0) & (target < upper_bound) & (T > 0)
+    sigma = np.full(price.size, np.nan)
+    sigma[valid] = _initial_guess(call_price[valid], S[valid], discounted_strike[valid], T[valid])
+    low = np.full(price.size, 0.0)
+    high = np.full(price.size, np.inf)
+
+    active = np.flatnonzero(valid)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        s, k, t, rate, p = S[active], K[active], T[active], r[active], phi[active]
+        vol = sigma[active]
+        d1, d2, discount_factor = _d1_d2(s, k, t, rate, vol)
+        model_price = p * (s * ndtr(p * d1) - k * discount_factor * ndtr(p * d2))
+        diff = model_price - target[active]
+
+        converged = np.abs(diff) <= tol
+        too_high = diff > 0
+        high[active] = np.where(too_high, vol, high[active])
+        low[active] = np.where(too_high, low[active], vol)
+
+        vega = s * np.exp(-0.5 * d1**2) * np.sqrt(t / (2 * np.pi))
+        volga = vega * d1 * d2 / vol
+        newton_step = diff / vega
+        step = newton_step / (1 - 0.5 * newton_step * volga / vega)
+        candidate = vol - step
+
+        lo, hi = low[active], high[active]
+        outside = ~np.isfinite(candidate) | (candidate <= lo) | (candidate >= hi)
+        bisection = np.where(np.isinf(hi), 2 * vol, 0.5 * (lo + hi))
+        candidate = np.where(outside, bisection, candidate)
+        converged |= np.abs(candidate - vol) <= 1e-15 * vol
+
+        sigma[active] = np.where(converged, vol, np.minimum(candidate, MAX_VOLATILITY))
+        # Quotes that would need more than MAX_VOLATILITY have no usable solution
+        pinned = ~converged & (vol >= MAX_VOLATILITY)
+        sigma[active[pinned]] = np.nan
+        active = active[~converged & ~pinned]
+
+    # Quotes still unconverged after max_iter
+    sigma[active] = np.nan
+    return sigma.reshape(shape)
+
+@instrumented()
+def american_implied_volatility(price, S, K, T, r, N, option_type='put', tol=1e-6, max_iter=30):
+    """
+    Invert the binomial American model for the implied volatility of arrays of prices.
+
+    Starts from the European implied volatility and refines it with a vectorized
+    secant iteration on the batched binomial pricer. Each element keeps a bracket and
+    falls back to bisection when a secant step leaves it; only unconverged contracts are
+    repriced on each pass. Contracts that do not converge within max_iter, or whose
+    bracket collapses without matching the price, are reported as NaN rather than
+    returning the last iterate.
+
+    Parameters:
+    price (float or np.ndarray): Observed American option price(s)
+    S (float or np.ndarray): Current stock price(s)
+    K (float or np.ndarray): Strike price(s)
+    T (float or np.ndarray): Time(s) to maturity (in years)
+    r (float or np.ndarray): Risk-free interest rate(s)
+    N (int or np.ndarray): Number(s) of steps in the binomial tree
+    option_type (str or np.ndarray): 'call' or 'put', per quote or for all of them
+    tol (float): Absolute price tolerance
+    max_iter (int): Maximum number of iterations
+
+    Returns:
+    np.ndarray: Implied volatilities, NaN where no volatility in [MIN_VOLATILITY, MAX_VOLATILITY]
+                reproduces the price within tol
+    """
+    price, S, K, T, r, N, option_type = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(S, dtype=float), np.asarray(K, dtype=float),
+        np.asarray(T, dtype=float), np.asarray(r, dtype=float), np.asarray(N), np.asarray(option_type))
+    shape = price.shape
+    price, S, K, T, r, N, option_type = (a.ravel() for a in (price, S, K, T, r, N, option_type))
+
+    def objective(idx, vol):
+        return binomial_american_batch(S[idx], K[idx], T[idx], r[idx], vol, N[idx], option_type[idx]) - price[idx]
+
+    intrinsic = np.maximum(np.where(option_type == 'call', S - K, K - S), 0)
+    valid = (price >= intrinsic) & (price < np.where(option_type == 'call', S, K)) & (T > 0)
+    start = implied_volatility(price, S, K, T, r, option_type)
+    start = np.clip(np.where(np.isfinite(start), start, 0.3), MIN_VOLATILITY, MAX_VOLATILITY)
+
+    sigma = np.full(price.size, np.nan)
+    low = np.full(price.size, MIN_VOLATILITY)
+    high = np.full(price.size, MAX_VOLATILITY)
+    active = np.flatnonzero(valid)
+    previous_vol = start[active]
+    previous_diff = objective(active, previous_vol)
+    vol = previous_vol * 0.98
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        diff = objective(active, vol)
+        converged = np.abs(diff) <= tol
+        too_high = diff > 0
+        high[active] = np.where(too_high, np.minimum(high[active], vol), high[active])
+        low[active] = np.where(too_high, low[active], np.maximum(low[active], vol))
+
+        slope = (diff - previous_diff) / (vol - previous_vol)
+        candidate = vol - diff / slope
+        lo, hi = low[active], high[active]
+        outside = ~np.isfinite(candidate) | (candidate <= lo) | (candidate >= hi)
+        candidate = np.where(outside, 0.5 * (lo + hi), candidate)
+
+        # Only converged contracts get a volatility; the rest stay NaN
+        sigma[active[converged]] = vol[converged]
+        keep = ~converged & (hi - lo > 1e-12)
+        active, previous_vol, previous_diff, vol = active[keep], vol[keep], diff[keep], candidate[keep]
+
+    return sigma.reshape(shape)
@@ -1,12 +1,165 @@
+import concurrent.futures
+import os
+
 import numpy as np
 
+from models.european.normal import ndtri
+from utils.instrumentation import instrumented
+
+# Independently scrambled point sets used to estimate the error of quasi-random runs
+_QMC_REPLICATES = 16
+VARIANCE_REDUCTION_METHODS = (None, 'antithetic', 'control_variate', 'sobol', 'halton')
+# Peak working memory per simulated path (normals, terminal prices, payoffs, control);
+# quasi-random draws also hold the uniforms and the inverse normal CDF temporaries
+_BYTES_PER_PATH = {None: 64, 'antithetic': 64, 'control_variate': 64, 'sobol': 160, 'halton': 160}
+# Upper bound on path values (paths x time steps) held by one chunk of full paths
+_MAX_PATH_ELEMENTS = 2_000_000
+
+def simulate_paths(S, T, r, sigma, steps, n_paths, rng, chunk_size=None):
+    """
+    Generate geometric Brownian motion paths in chunks of full time-step matrices.
+
+    Each chunk is built with one vectorized cumulative sum over log increments, and
+    chunks are yielded one at a time so memory stays bounded for any number of paths.
+
+    Parameters:
+    S (float): Current stock price
+    T (float): Time to maturity (in years)
+    r (float): Risk-free interest rate
+    sigma (float): Volatility of the stock
+    steps (int): Number of equally spaced time steps up to maturity
+    n_paths (int): Total number of paths to generate
+    rng (np.random.Generator): Source of randomness
+    chunk_size (int): Paths per chunk (defaults to a bounded number of path values)
+
+    Yields:
+    np.ndarray: Stock prices of shape (paths_in_chunk, steps) at times dt, 2*dt, ..., T
+    """
+    dt = T / steps
+    drift = (r - 0.5 * sigma**2) * dt
+    vol = sigma * np.sqrt(dt)
+    chunk_size = chunk_size or max(1, _MAX_PATH_ELEMENTS // steps)
+    for start in range(0, n_paths, chunk_size):
+        paths = rng.standard_normal((min(chunk_size, n_paths - start), steps))
+        paths *= vol
+        paths += drift
+        np.cumsum(paths, axis=1, out=paths)
+        np.exp(paths, out=paths)
+        paths *= S
+        yield paths
+
+class _PayoffSums:
+    """
+    Running sums of per-unit discounted payoffs y and zero-mean control values c.
+
+    Keeping only sums of y, y**2, c, c**2 and y*c lets chunks be simulated and
+    combined without ever holding all of the paths in memory.
+    """
+    def __init__(self):
+        self.count = 0
+        self.paths = 0
+        self.sums = np.zeros(5)
+
+    def add(self, y, c):
+        self.count += len(y)
+        self.sums += (y.sum(), y @ y, c.sum(), c @ c, y @ c)
+
+    def merge(self, other):
+        self.count += other.count
+        self.paths += other.paths
+        self.sums += other.sums
+
+    def estimate(self, use_control):
+        """
+        Calculate the price and its standard error from the running sums.
+
+        Parameters:
+        use_control (bool): Apply the control variate adjustment
+
+        Returns:
+        tuple: (option_price, standard_error)
+        """
+        n = self.count
+        sum_y, sum_yy, sum_c, sum_cc, sum_yc = self.sums
+        mean_y = sum_y / n
+        variance = (sum_yy - n * mean_y**2) / (n - 1)
+        if use_control:
+            mean_c = sum_c / n
+            variance_c = (sum_cc - n * mean_c**2) / (n - 1)
+            if variance_c > 0:
+                covariance = (sum_yc - n * mean_y * mean_c) / (n - 1)
+                beta = covariance / variance_c
+                mean_y -= beta * mean_c
+                variance -= covariance * beta
+        return mean_y, np.sqrt(max(variance, 0) / n)
+
+def _simulate_worker(model, n, seed_sequence, chunk_size):
+    """
+    Simulate n paths of model on an independent random stream, chunk by chunk.
+
+    Runs in a pool worker, so it is a module-level function that only returns sums.
+
+    Returns:
+    tuple: (call_sums, put_sums)
+    """
+    rng = np.random.default_rng(seed_sequence)
+    call_sums, put_sums = _PayoffSums(), _PayoffSums()
+    # Equal-sized chunks keep every quasi-random point set the same size
+    chunks = -(-n // chunk_size)
+    for _ in range(chunks):
+        model._simulate_chunk(-(-n // chunks), rng, call_sums, put_sums)
+    return call_sums, put_sums
+
+@instrumented()
+def monte_carlo_prices(S, K, T, r, sigma, N, seed=None):
+    """
+    Price European calls and puts for a whole grid of inputs with common random numbers.
+
+    Inputs broadcast against each other and every element is priced from the same N
+    standard normals, which keeps surfaces smooth across neighbouring cells. Elements
+    are processed in chunks so memory stays bounded for large grids.
+
+    Parameters:
+    S (float or np.ndarray): Current stock price(s)
+    K (float or np.ndarray): Strike price(s)
+    T (float or np.ndarray): Time(s) to maturity (in years)
+    r (float or np.ndarray): Risk-free interest rate(s)
+    sigma (float or np.ndarray): Volatility(ies) of the stock
+    N (int): Number of simulated paths
+    seed (int or np.random.Generator): Seed or generator for reproducible draws
+
+    Returns:
+    tuple: (call_prices, put_prices) with the broadcast shape of the inputs
+    """
+    S, K, T, r, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma)))
+    shape = S.shape
+    S, K, T, r, sigma = (a.ravel() for a in (S, K, T, r, sigma))
+    Z = np.random.default_rng(seed).standard_normal(int(N))
+
+    call_prices = np.empty(S.size)
+    put_prices = np.empty(S.size)
+    chunk = max(1, _MAX_PATH_ELEMENTS // len(Z))
+    for start in range(0, S.size, chunk):
+        idx = slice(start, start + chunk)
+        drift = ((r[idx] - 0.5 * sigma[idx]**2) * T[idx])[:, None]
+        vol = (sigma[idx] * np.sqrt(T[idx]))[:, None]
+        ST = S[idx, None] * np.exp(drift + vol * Z)
+        discount_factor = np.exp(-r[idx] * T[idx])
+        call_prices[idx] = discount_factor * np.maximum(ST - K[idx, None], 0).mean(axis=1)
+        put_prices[idx] = discount_factor * np.maximum(K[idx, None] - ST, 0).mean(axis=1)
+    return call_prices.reshape(shape), put_prices.reshape(shape)
+
 # https://www.investopedia.com/articles/investing/112514/monte-carlo-simulation-basics.asp#:~:text=Monte%20Carlo%20is%20used%20for,to%20get%20the%20option%20price.
 # https://corporatefinanceinstitute.com/resources/derivatives/option-pricing-models/#:~:text=Option%20Pricing%20Models%20are%20mathematical,fair%20value%20of%20an%20option.
 class MonteCarlo:
-    def __init__(self, S, K, T, r, sigma, N):
+    def __init__(self, S, K, T, r, sigma, N, variance_reduction=None, seed=None):
         """
         Initialize the MonteCarlo model parameters.
 
+        Antithetic and quasi-random draws come in whole pairs or point sets, so the number
+        of paths actually simulated can differ from N (Sobol point sets are rounded up to
+        a power of two); the count of the last run is kept in paths_simulated.
+
         Parameters:
         S (float): Current stock price
         K (float): Strike price
@@ -14,21 +167,212 @@ class MonteCarlo:
         r (float): Risk-free interest rate
         sigma (float): Volatility of the stock
         N (int): Number of steps in the continuous time simulation
+        variance_reduction (str): None, 'antithetic', 'control_variate', 'sobol' or 'halton'
+        seed (int or np.random.Generator): Seed or generator for reproducible draws
         """
+        if variance_reduction not in VARIANCE_REDUCTION_METHODS:
+            raise ValueError(f"variance_reduction must be one of {VARIANCE_REDUCTION_METHODS}, got {variance_reduction!r}")
         self.curr_price = S
         self.strike_price = K
         self.time_to_maturity = T
         self.riskfree_interest_rate = r
         self.volatility = sigma
         self.simulations = int(N)
+        self.variance_reduction = variance_reduction
+        self.rng = np.random.default_rng(seed)
+        self.paths_simulated = 0
+
+    def _standard_normals(self, n, rng):
+        """
+        Draw standard normals for n paths, grouped into independent units.
+
+        Each row is one independent unit whose mean payoff is a sample for the error
+        estimate: a single path, an antithetic pair (Z, -Z) or a scrambled quasi-random
+        point set.
+
+        Parameters:
+        n (int): Number of paths to draw
+        rng (np.random.Generator): Source of randomness
+
+        Returns:
+        np.ndarray: Normals of shape (units, paths_per_unit)
+        """
+        if self.variance_reduction == 'antithetic':
+            Z = rng.standard_normal(max(n // 2, 2))
+            return np.stack([Z, -Z], axis=1)
+        if self.variance_reduction in ('sobol', 'halton'):
+            # SciPy is only needed for quasi-random draws, so it is not imported up front
+            from scipy.stats import qmc
+
+            points = max(n // _QMC_REPLICATES, 2)
+            if self.variance_reduction == 'sobol':
+                # Sobol sequences keep their balance properties only for powers of two; rounding
+                # up means at least the requested number of paths is simulated
+                points = 1 << (points - 1).bit_length()
+                engines = [qmc.Sobol(d=1, scramble=True, seed=rng) for _ in range(_QMC_REPLICATES)]
+            else:
+                engines = [qmc.Halton(d=1, scramble=True, seed=rng) for _ in range(_QMC_REPLICATES)]
+            U = np.stack([engine.random(points)[:, 0] for engine in engines])
+            return ndtri(np.clip(U, 1e-16, 1 - 1e-16))
+        return rng.standard_normal(max(n, 2))[:, None]
 
-    def stock_price_at_maturity(self):
+    def _whole_paths(self, n):
+        """
+        Round a path count down to one that _standard_normals simulates exactly.
+
+        Antithetic runs use whole pairs and quasi-random runs whole point sets (a power of
+        two per replicate for Sobol). Counts below the smallest unit round up to it.
+
+        Parameters:
+        n (int): Largest number of paths wanted
+
+        Returns:
+        int: Number of paths that will actually be simulated
+        """
+        n = int(n)
+        if self.variance_reduction == 'antithetic':
+            return max(n - n % 2, 4)
+        if self.variance_reduction in ('sobol', 'halton'):
+            points = max(n // _QMC_REPLICATES, 2)
+            if self.variance_reduction == 'sobol':
+                points = 1 << (points.bit_length() - 1)
+            return points * _QMC_REPLICATES
+        return max(n, 2)
+
+    def stock_price_at_maturity(self, Z=None):
         # Random array of variable µ
-        Z = np.random.standard_normal(self.simulations)
+        if Z is None:
+            Z = self.rng.standard_normal(self.simulations)
         # geometric Brownian motion model
         ST = self.curr_price * np.exp((self.riskfree_interest_rate - 0.5 * self.volatility**2) * self.time_to_maturity + self.volatility * np.sqrt(self.time_to_maturity) * Z)
         return ST
 
+    def _simulate_chunk(self, n, rng, call_sums, put_sums):
+        """
+        Simulate n paths and add their per-unit discounted payoffs to the running sums.
+
+        Parameters:
+        n (int): Number of paths to simulate
+        rng (np.random.Generator): Source of randomness
+        call_sums (_PayoffSums): Running sums for the call
+        put_sums (_PayoffSums): Running sums for the put
+
+        Returns:
+        int: Number of paths actually simulated
+        """
+        Z = self._standard_normals(n, rng)
+        ST = self.stock_price_at_maturity(Z)
+        discount_factor = np.exp(-self.riskfree_interest_rate * self.time_to_maturity)
+        call_payoff = discount_factor * np.maximum(ST - self.strike_price, 0)
+        put_payoff = discount_factor * np.maximum(self.strike_price - ST, 0)
+
+        # The discounted terminal price has a closed-form mean: today's price
+        control = (discount_factor * ST - self.curr_price).mean(axis=1)
+        call_sums.add(call_payoff.mean(axis=1), control)
+        put_sums.add(put_payoff.mean(axis=1), control)
+        call_sums.paths += Z.size
+        put_sums.paths += Z.size
+        return Z.size
+
+    @instrumented()
+    def prices_with_error(self):
+        """
+        Simulate terminal prices once and price both the call and the put from the same draws.
+
+        Sharing the draws halves the simulation cost and keeps put-call parity: the call
+        minus the put equals the discounted mean simulated price minus the discounted strike.
+
+        Returns:
+        tuple: ((call_price, call_standard_error), (put_price, put_standard_error))
+        """
+        call_sums, put_sums = _PayoffSums(), _PayoffSums()
+        self.paths_simulated = self._simulate_chunk(self.simulations, self.rng, call_sums, put_sums)
+        use_control = self.variance_reduction == 'control_variate'
+        return call_sums.estimate(use_control), put_sums.estimate(use_control)
+
+    @instrumented()
+    def prices_streaming(self, ci_width, confidence=0.95, memory_limit_mb=64, max_paths=None):
+        """
+        Price the call and put in fixed-size chunks until both confidence intervals are narrow enough.
+
+        Only running sums of the payoffs (and their squares) are kept between chunks, so
+        memory is bounded by the chunk size regardless of how many paths are needed. Each
+        chunk is a whole number of units (pairs or point sets) that fits both the memory
+        ceiling and the paths left under max_paths.
+
+        Parameters:
+        ci_width (float): Target full width of the confidence interval for both prices
+        confidence (float): Confidence level of the interval
+        memory_limit_mb (float): Approximate memory ceiling for one chunk of paths
+        max_paths (int): Stop once this many paths are simulated even if the target is not met
+
+        Returns:
+        tuple: ((call_price, call_standard_error), (put_price, put_standard_error), paths_simulated)
+        """
+        chunk_size = memory_limit_mb * 2**20 // _BYTES_PER_PATH[self.variance_reduction]
+        z = ndtri(0.5 + confidence / 2)
+        use_control = self.variance_reduction == 'control_variate'
+        call_sums, put_sums = _PayoffSums(), _PayoffSums()
+        paths = 0
+        while True:
+            remaining = chunk_size if max_paths is None else min(chunk_size, max_paths - paths)
+            paths += self._simulate_chunk(self._whole_paths(remaining), self.rng, call_sums, put_sums)
+            call, put = call_sums.estimate(use_control), put_sums.estimate(use_control)
+            widest = 2 * z * max(call[1], put[1])
+            # Stop when not even the smallest unit fits under max_paths any more
+            if widest <= ci_width or (max_paths is not None and self._whole_paths(max_paths - paths) > max_paths - paths):
+                self.paths_simulated = paths
+                return call, put, paths
+
+    @instrumented()
+    def prices_parallel(self, workers=None, executor='process', chunk_size=2**20):
+        """
+        Split the simulations across a process or thread pool and merge the partial sums.
+
+        Every worker gets its own stream spawned from the model's SeedSequence and the
+        partial sums are merged in worker order, so for a given seed and worker count the
+        result is bit-identical from run to run, including repeated calls on one model.
+
+        Parameters:
+        workers (int): Number of workers (defaults to the number of CPUs)
+        executor (str): 'process' or 'thread'
+        chunk_size (int): Paths simulated at a time inside each worker
+
+        Returns:
+        tuple: ((call_price, call_standard_error), (put_price, put_standard_error))
+        """
+        workers = workers or os.cpu_count() or 1
+        # Spawning advances the parent, so spawn from a fresh copy to make repeated calls
+        # on the same model draw the same streams
+        seed_seq = self.rng.bit_generator.seed_seq
+        seed_sequences = np.random.SeedSequence(seed_seq.entropy, spawn_key=seed_seq.spawn_key,
+                                                pool_size=seed_seq.pool_size).spawn(workers)
+        share, extra = divmod(self.simulations, workers)
+        shares = [share + (i < extra) for i in range(workers)]
+
+        # concurrent.futures loads the executor (and multiprocessing) on first attribute access
+        pool_class = concurrent.futures.ProcessPoolExecutor if executor == 'process' else concurrent.futures.ThreadPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            partials = list(pool.map(_simulate_worker, [self] * workers, shares, seed_sequences, [chunk_size] * workers))
+
+        call_sums, put_sums = _PayoffSums(), _PayoffSums()
+        for worker_call_sums, worker_put_sums in partials:
+            call_sums.merge(worker_call_sums)
+            put_sums.merge(worker_put_sums)
+        self.paths_simulated = call_sums.paths
+        use_control = self.variance_reduction == 'control_variate'
+        return call_sums.estimate(use_control), put_sums.estimate(use_control)
+
+    def prices(self):
+        """
+        Calculate the European call and put prices from one shared set of simulated paths.
+
+        Returns:
+        tuple: (call_price, put_price)
+        """
+        (call_price, _), (put_price, _) = self.prices_with_error()
+        return call_price, put_price
+
     def call_price(self):
         """
         Calculate the European call option price using the MonteCarlo model.
@@ -36,13 +380,7 @@ class MonteCarlo:
         Returns:
         float: The European call option price
         """
-        ST = self.stock_price_at_maturity()
-        payoff = np.maximum(ST - self.strike_price, 0)
-
-        # Discount payoffs back to present value
-        discount_factor = np.exp(-self.riskfree_interest_rate * self.time_to_maturity)
-        option_price = discount_factor * np.mean(payoff)
-        return option_price
+        return self.prices_with_error()[0][0]
     
     def put_price(self):
         """
@@ -51,10 +389,22 @@ class MonteCarlo:
         Returns:
         float: The European put option price
         """
-        ST = self.stock_price_at_maturity()
-        payoff = np.maximum(self.strike_price - ST, 0)
+        return self.prices_with_error()[1][0]
 
-        # Discount payoffs back to present value
-        discount_factor = np.exp(-self.riskfree_interest_rate * self.time_to_maturity)
-        option_price = discount_factor * np.mean(payoff)
-        return option_price
+    def call_price_with_error(self):
+        """
+        Calculate the European call option price together with its standard error.
+
+        Returns:
+        tuple: (call_price, standard_error)
+        """
+        return self.prices_with_error()[0]
+
+    def put_price_with_error(self):
+        """
+        Calculate the European put option price together with its standard error.
+
+        Returns:
+        tuple: (put_price, standard_error)
+        """
+        return self.prices_with_error()[1]
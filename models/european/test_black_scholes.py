@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from models.european.BlackScholes import BlackScholes, black_scholes_greeks, black_scholes_prices
+
+STRIKES = np.linspace(50, 150, 101)
+
+def reference_prices(S, K, T, r, sigma):
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    return (S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2),
+            K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1))
+
+def test_chain_matches_reference():
+    calls, puts = black_scholes_prices(100, STRIKES, 0.5, 0.03, 0.3)
+    expected_calls, expected_puts = reference_prices(100, STRIKES, 0.5, 0.03, 0.3)
+    np.testing.assert_allclose(calls, expected_calls, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(puts, expected_puts, rtol=1e-12, atol=1e-12)
+
+def test_inputs_broadcast():
+    calls, puts = black_scholes_prices(np.array([90.0, 110.0])[:, None, None], STRIKES[None, :, None], 1.0, 0.05,
+                                       np.array([0.1, 0.2, 0.4])[None, None, :])
+    assert calls.shape == puts.shape == (2, STRIKES.size, 3)
+    parity = np.array([90.0, 110.0])[:, None, None] - STRIKES[None, :, None] * np.exp(-0.05)
+    np.testing.assert_allclose(calls - puts, np.broadcast_to(parity, calls.shape), atol=1e-10)
+
+def test_scalar_class_matches_batch():
+    model = BlackScholes(100, 95, 1.0, 0.05, 0.2)
+    call, put = black_scholes_prices(100, 95, 1.0, 0.05, 0.2)
+    assert model.call_price() == pytest.approx(call)
+    assert model.put_price() == pytest.approx(put)
+    assert model.prices() == pytest.approx((call, put))
+
+@pytest.mark.parametrize("S, K, T, r, sigma", [(100, 100, 1.0, 0.05, 0.2), (80, 100, 0.25, 0.01, 0.5), (130, 100, 2.0, 0.08, 0.15)])
+def test_greeks_match_finite_differences(S, K, T, r, sigma):
+    greeks = black_scholes_greeks(S, K, T, r, sigma)
+    h = 1e-4
+
+    def bumped(**bump):
+        inputs = {"S": S, "K": K, "T": T, "r": r, "sigma": sigma}
+        up = black_scholes_prices(**{**inputs, **{name: inputs[name] + size for name, size in bump.items()}})
+        down = black_scholes_prices(**{**inputs, **{name: inputs[name] - size for name, size in bump.items()}})
+        return [(u - d) / (2 * next(iter(bump.values()))) for u, d in zip(up, down)]
+
+    call_delta, put_delta = bumped(S=h * S)
+    assert greeks["call_delta"] == pytest.approx(call_delta, rel=1e-6)
+    assert greeks["put_delta"] == pytest.approx(put_delta, rel=1e-6)
+    calls = [black_scholes_prices(S + bump, K, T, r, sigma)[0] for bump in (-1e-2 * S, 0, 1e-2 * S)]
+    assert greeks["gamma"] == pytest.approx((calls[2] - 2 * calls[1] + calls[0]) / (1e-2 * S) ** 2, rel=1e-3)
+    assert greeks["vega"] == pytest.approx(bumped(sigma=h)[0], rel=1e-6)
+    call_rho, put_rho = bumped(r=h)
+    assert greeks["call_rho"] == pytest.approx(call_rho, rel=1e-6)
+    assert greeks["put_rho"] == pytest.approx(put_rho, rel=1e-6)
+    # Theta is the derivative with respect to calendar time, minus the one in T
+    call_theta, put_theta = bumped(T=h)
+    assert greeks["call_theta"] == pytest.approx(-call_theta, rel=1e-6)
+    assert greeks["put_theta"] == pytest.approx(-put_theta, rel=1e-6)
+
+def test_greeks_broadcast_over_a_chain():
+    greeks = BlackScholes(100, STRIKES, 1.0, 0.05, 0.2).greeks()
+    assert all(values.shape == STRIKES.shape for values in greeks.values())
+    np.testing.assert_allclose(greeks["call_delta"] - greeks["put_delta"], 1)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import black_scholes_prices
+from models.european.ImpliedVolatility import american_implied_volatility, implied_volatility
+
+S = np.array([60.0, 90.0, 100.0, 110.0, 160.0])
+VOLS = np.array([0.05, 0.2, 0.35, 0.8, 1.5])
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_european_round_trip(option_type):
+    calls, puts = black_scholes_prices(S[:, None], 100, 1.0, 0.05, VOLS[None, :])
+    prices = calls if option_type == "call" else puts
+    recovered = implied_volatility(prices, S[:, None], 100, 1.0, 0.05, option_type)
+    # Deep in-the-money low-vol quotes carry too little time value to invert precisely
+    vega_visible = prices - np.maximum(0, (S[:, None] - 100 * np.exp(-0.05)) * (1 if option_type == "call" else -1)) > 1e-6
+    np.testing.assert_allclose(recovered[vega_visible], np.broadcast_to(VOLS, prices.shape)[vega_visible], rtol=1e-6)
+
+def test_european_outside_bounds_is_nan():
+    # Above the stock price, below intrinsic value, and expired
+    assert np.isnan(implied_volatility([101.0, 1.0, 5.0], [100.0, 120.0, 100.0], 100, [1.0, 1.0, 0.0], 0.0, "call")).all()
+
+def test_european_unconverged_is_nan():
+    assert np.isnan(implied_volatility(5.0, 100.0, 100, 1.0, 0.05, "call", max_iter=1))
+    assert implied_volatility(5.0, 100.0, 100, 1.0, 0.05, "call") == pytest.approx(0.0354, abs=1e-3)
+
+def test_european_beyond_max_volatility_is_nan():
+    # Just below the stock price: the call only gets this expensive at an absurd volatility
+    assert np.isnan(implied_volatility(99.999999, 100.0, 100, 1.0, 0.05, "call"))
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_american_round_trip(option_type):
+    # Near the money, where the price still depends on the volatility (deep in-the-money
+    # American puts are worth their intrinsic value over a whole range of volatilities)
+    spots, vols = np.array([90.0, 95.0, 100.0, 105.0, 110.0]), np.array([0.15, 0.2, 0.35, 0.8, 1.5])
+    prices = binomial_american_batch(spots, 100, 1.0, 0.05, vols, 200, option_type)
+    recovered = american_implied_volatility(prices, spots, 100, 1.0, 0.05, 200, option_type)
+    np.testing.assert_allclose(recovered, vols, rtol=1e-4)
+
+def test_american_outside_arbitrage_bounds_is_nan():
+    # Below intrinsic value, above the strike, and unreachable within MAX_VOLATILITY
+    recovered = american_implied_volatility([19.0, 101.0, 99.9], [80.0, 100.0, 100.0], 100, 1.0, 0.05, 200, "put")
+    assert np.isnan(recovered).all()
+
+def test_american_unconverged_is_nan():
+    assert np.isnan(american_implied_volatility(5.0, 100.0, 100, 1.0, 0.05, 200, "put", max_iter=1))
@@ -0,0 +1,78 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from models.european.BlackScholes import black_scholes_prices
+from models.european.MonteCarlo import VARIANCE_REDUCTION_METHODS, MonteCarlo, monte_carlo_prices
+
+S, K, T, r, sigma = 100.0, 105.0, 1.0, 0.05, 0.25
+CALL, PUT = black_scholes_prices(S, K, T, r, sigma)
+
+@pytest.mark.parametrize("method", VARIANCE_REDUCTION_METHODS)
+def test_prices_converge_to_black_scholes(method):
+    (call, call_error), (put, put_error) = MonteCarlo(S, K, T, r, sigma, 50_000, method, seed=1).prices_with_error()
+    assert abs(call - CALL) < 4 * call_error + 1e-3
+    assert abs(put - PUT) < 4 * put_error + 1e-3
+    assert 0 < call_error < 0.1
+
+def test_error_shrinks_with_paths():
+    errors = [MonteCarlo(S, K, T, r, sigma, n, seed=2).prices_with_error()[0][1] for n in (10_000, 160_000)]
+    assert errors[1] == pytest.approx(errors[0] / 4, rel=0.1)
+
+def test_sobol_rounds_paths_up_to_whole_point_sets():
+    model = MonteCarlo(S, K, T, r, sigma, 10_000, 'sobol', seed=0)
+    model.prices_with_error()
+    # 16 scrambled replicates of 625 points, rounded up to 1024 each
+    assert model.paths_simulated == 16 * 1024
+
+@pytest.mark.parametrize("method, requested, simulated", [(None, 1001, 1001), ('antithetic', 1001, 1000), ('halton', 1000, 992)])
+def test_paths_simulated_is_reported(method, requested, simulated):
+    model = MonteCarlo(S, K, T, r, sigma, requested, method, seed=0)
+    model.prices_with_error()
+    assert model.paths_simulated == simulated
+
+def test_streaming_meets_the_target_width():
+    model = MonteCarlo(S, K, T, r, sigma, 0, 'antithetic', seed=3)
+    (call, call_error), (put, put_error), paths = model.prices_streaming(ci_width=0.05, memory_limit_mb=1)
+    assert 2 * 1.96 * max(call_error, put_error) <= 0.05
+    assert paths == model.paths_simulated
+    assert abs(call - CALL) < 4 * call_error
+
+@pytest.mark.parametrize("method", ['sobol', 'halton'])
+def test_streaming_quasi_random_stays_under_the_memory_ceiling(method):
+    model = MonteCarlo(S, K, T, r, sigma, 0, method, seed=3)
+    model.prices_streaming(ci_width=0, memory_limit_mb=8, max_paths=2**16)
+    tracemalloc.start()
+    try:
+        model.prices_streaming(ci_width=0, memory_limit_mb=8, max_paths=3 * 2**17)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 8 * 2**20
+
+@pytest.mark.parametrize("method, max_paths, simulated", [('sobol', 1_966_080, 1_966_080), ('halton', 1_000, 992), ('antithetic', 1_001, 1_000), (None, 1_001, 1_001)])
+def test_streaming_never_exceeds_max_paths(method, max_paths, simulated):
+    # 1,966,080 = 16 * 122,880 Sobol paths are covered exactly by power-of-two point sets
+    model = MonteCarlo(S, K, T, r, sigma, 0, method, seed=3)
+    assert model.prices_streaming(ci_width=0, memory_limit_mb=16, max_paths=max_paths)[2] == simulated
+
+def test_parallel_is_reproducible():
+    first = MonteCarlo(S, K, T, r, sigma, 40_000, seed=4).prices_parallel(workers=2, executor='thread', chunk_size=8_000)
+    second = MonteCarlo(S, K, T, r, sigma, 40_000, seed=4).prices_parallel(workers=2, executor='thread', chunk_size=8_000)
+    assert first == second
+    assert abs(first[0][0] - CALL) < 4 * first[0][1]
+
+def test_parallel_repeats_on_the_same_model():
+    model = MonteCarlo(S, K, T, r, sigma, 40_000, seed=4)
+    first = model.prices_parallel(workers=2, executor='thread', chunk_size=8_000)
+    assert model.prices_parallel(workers=2, executor='thread', chunk_size=8_000) == first
+
+def test_grid_prices_use_common_random_numbers():
+    spots = np.linspace(80, 120, 41)
+    calls, puts = monte_carlo_prices(spots, K, T, r, sigma, 20_000, seed=5)
+    expected_calls, expected_puts = black_scholes_prices(spots, K, T, r, sigma)
+    np.testing.assert_allclose(calls, expected_calls, atol=0.5)
+    # The same draws for every spot keep the surface monotone and call - put linear in the spot
+    assert np.all(np.diff(calls) > 0)
+    np.testing.assert_allclose(np.diff(calls - puts, 2), 0, atol=1e-9)
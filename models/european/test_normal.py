@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from models.european.BlackScholes import BlackScholes, black_scholes_greeks, black_scholes_prices
+from models.european.normal import ndtr, ndtri
+
+scipy_special = pytest.importorskip("scipy.special")
+
+def test_ndtr_matches_scipy():
+    x = np.linspace(-37, 37, 20001)
+    assert np.max(np.abs(ndtr(x) - scipy_special.ndtr(x))) < 1e-15
+    lower = x < -3
+    relative = np.abs(ndtr(x[lower]) - scipy_special.ndtr(x[lower])) / scipy_special.ndtr(x[lower])
+    assert relative.max() < 1e-12
+
+@pytest.mark.parametrize("x", [-40.0, -8.0, -4.0, 0.0, 4.0, 8.0, 40.0, np.inf, -np.inf])
+def test_ndtr_scalar_tails(x):
+    result = ndtr(x)
+    assert np.ndim(result) == 0
+    assert result == pytest.approx(scipy_special.ndtr(x), rel=1e-12, abs=1e-300)
+
+def test_ndtr_keeps_shape():
+    assert ndtr(np.zeros((2, 3))).shape == (2, 3)
+    assert np.isnan(ndtr(np.nan))
+
+def test_ndtri_inverts_ndtr():
+    p = np.concatenate([np.logspace(-200, -1, 500), np.linspace(0.01, 0.99, 99)])
+    np.testing.assert_allclose(ndtri(p), scipy_special.ndtri(p), rtol=1e-9)
+    assert ndtri(0.5) == 0.0
+
+def test_black_scholes_deep_in_and_out_of_the_money_scalars():
+    call = BlackScholes(100, 30, 1, 0.05, 0.2).call_price()
+    assert call == pytest.approx(100 - 30 * np.exp(-0.05))
+    assert BlackScholes(30, 300, 1, 0.05, 0.2).call_price() == pytest.approx(0.0, abs=1e-12)
+    greeks = black_scholes_greeks(100.0, 30.0, 1.0, 0.05, 0.2)
+    assert greeks["call_delta"] == pytest.approx(1.0)
+    assert greeks["gamma"] == pytest.approx(0.0, abs=1e-9)
+
+def test_black_scholes_at_expiry_is_intrinsic():
+    with np.errstate(divide="ignore"):
+        call, put = black_scholes_prices(110.0, 100.0, 0.0, 0.05, 0.2)
+        assert (call, put) == (pytest.approx(10.0), pytest.approx(0.0))
+        call, put = black_scholes_prices(np.array([90.0, 110.0]), 100.0, 0.0, 0.05, 0.2)
+    np.testing.assert_allclose(call, [0.0, 10.0])
+    np.testing.assert_allclose(put, [10.0, 0.0])
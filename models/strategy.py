@@ -0,0 +1,158 @@
+import numpy as np
+
+from models.european.BlackScholes import black_scholes_prices
+from utils.instrumentation import instrumented
+
+class Leg:
+    def __init__(self, position, option_type, strike, quantity=1, premium=0.0, expiry=0.0):
+        """
+        Initialize one option leg of a strategy.
+
+        Parameters:
+        position (str): 'long' or 'short'
+        option_type (str): 'call' or 'put'
+        strike (float): Strike price
+        quantity (float): Number of contracts
+        premium (float): Premium paid (long) or received (short) per contract
+        expiry (float): Time to expiry (in years) from today
+        """
+        if position not in ('long', 'short'):
+            raise ValueError(f"position must be 'long' or 'short', got {position!r}")
+        if option_type not in ('call', 'put'):
+            raise ValueError(f"option_type must be 'call' or 'put', got {option_type!r}")
+        self.position = position
+        self.option_type = option_type
+        self.strike = strike
+        self.quantity = quantity
+        self.premium = premium
+        self.expiry = expiry
+
+class Strategy:
+    def __init__(self, legs):
+        """
+        Initialize a portfolio of option legs evaluated together.
+
+        The legs are stored as parallel arrays so the whole book is evaluated with one
+        broadcasted (legs x prices) operation.
+
+        Parameters:
+        legs (list): Leg objects
+        """
+        self.legs = list(legs)
+        self.signs = np.array([1.0 if leg.position == 'long' else -1.0 for leg in self.legs])
+        self.phis = np.array([1.0 if leg.option_type == 'call' else -1.0 for leg in self.legs])
+        self.strikes = np.array([leg.strike for leg in self.legs], dtype=float)
+        self.quantities = np.array([leg.quantity for leg in self.legs], dtype=float)
+        self.premiums = np.array([leg.premium for leg in self.legs], dtype=float)
+        self.expiries = np.array([leg.expiry for leg in self.legs], dtype=float)
+
+    def horizon(self):
+        # P&L is evaluated when the first leg expires
+        return self.expiries.min() if self.legs else 0.0
+
+    def leg_values(self, stock_prices, r=0.0, sigma=None, horizon=None):
+        """
+        Value every leg over the price grid at the evaluation horizon.
+
+        Legs expiring at the horizon are worth their intrinsic value; legs that expire
+        later are valued with Black-Scholes over their remaining time.
+
+        Parameters:
+        stock_prices (np.ndarray): Underlying prices at the horizon
+        r (float): Risk-free interest rate for legs still alive
+        sigma (float): Volatility for legs still alive
+        horizon (float): Evaluation time in years (defaults to the first expiry)
+
+        Returns:
+        np.ndarray: Per-contract leg values of shape (legs, prices)
+        """
+        S = np.asarray(stock_prices, dtype=float)[None, :]
+        horizon = self.horizon() if horizon is None else horizon
+        values = np.maximum(self.phis[:, None] * (S - self.strikes[:, None]), 0)
+
+        remaining = self.expiries - horizon
+        alive = remaining > 0
+        if alive.any():
+            if sigma is None:
+                raise ValueError("sigma is required to value legs that expire after the horizon")
+            calls, puts = black_scholes_prices(S, self.strikes[alive, None], remaining[alive, None], r, sigma)
+            values[alive] = np.where(self.phis[alive, None] > 0, calls, puts)
+        return values
+
+    @instrumented()
+    def pnl(self, stock_prices, r=0.0, sigma=None, horizon=None):
+        """
+        Calculate the aggregate P&L of the strategy over a price grid.
+
+        Parameters:
+        stock_prices (np.ndarray): Underlying prices at the horizon
+        r (float): Risk-free interest rate for legs still alive
+        sigma (float): Volatility for legs still alive
+        horizon (float): Evaluation time in years (defaults to the first expiry)
+
+        Returns:
+        np.ndarray: P&L for every price in the grid
+        """
+        values = self.leg_values(stock_prices, r, sigma, horizon)
+        weights = self.signs * self.quantities
+        return weights @ values - weights @ self.premiums
+
+    def break_evens(self, stock_prices, pnl):
+        """
+        Find the prices where the P&L crosses zero, by linear interpolation on the grid.
+
+        Parameters:
+        stock_prices (np.ndarray): Price grid, sorted ascending
+        pnl (np.ndarray): P&L over the grid
+
+        Returns:
+        np.ndarray: Break-even prices
+        """
+        stock_prices = np.asarray(stock_prices, dtype=float)
+        sign = np.sign(pnl)
+        exact = stock_prices[sign == 0]
+        crossing = np.flatnonzero(sign[:-1] * sign[1:] < 0)
+        x0, x1 = stock_prices[crossing], stock_prices[crossing + 1]
+        y0, y1 = pnl[crossing], pnl[crossing + 1]
+        interpolated = x0 - y0 * (x1 - x0) / (y1 - y0)
+        return np.sort(np.concatenate([exact, interpolated]))
+
+    def summary(self, stock_prices, r=0.0, sigma=None, horizon=None):
+        """
+        Calculate P&L over a price grid, with break-evens and max profit/loss over all prices.
+
+        Max profit/loss are not limited to the grid. The P&L is also evaluated at S = 0 and
+        at every strike, which are the only kinks of the expiry P&L. Past the highest strike
+        it grows with slope equal to the net number of calls held (asymptotically so for legs
+        still alive), so a net long call position has unlimited profit and a net short one
+        unlimited loss. When every leg expires at the horizon the P&L is piecewise linear, so
+        the break-evens are exact, including any beyond the grid.
+
+        Returns:
+        dict: 'pnl' over stock_prices, 'break_evens', 'max_profit' and 'max_loss'
+        """
+        stock_prices = np.asarray(stock_prices, dtype=float)
+        pnl = self.pnl(stock_prices, r, sigma, horizon)
+        horizon = self.horizon() if horizon is None else horizon
+        at_expiry = np.all(self.expiries <= horizon)
+
+        points = np.unique(np.concatenate([[0.0], self.strikes, stock_prices]))
+        with np.errstate(divide='ignore'):
+            points_pnl = self.pnl(points, r, sigma, horizon)
+        net_calls = np.sum(self.signs * self.quantities * (self.phis > 0))
+        break_evens = self.break_evens(points, points_pnl)
+        if at_expiry and points_pnl[-1] * net_calls < 0:
+            # The last linear piece crosses zero past every kink and the grid
+            break_evens = np.append(break_evens, points[-1] - points_pnl[-1] / net_calls)
+
+        max_profit, max_loss = points_pnl.max(), points_pnl.min()
+        if net_calls > 0:
+            max_profit = np.inf
+        if net_calls < 0:
+            max_loss = -np.inf
+        return {
+            "pnl": pnl,
+            "break_evens": break_evens,
+            "max_profit": max_profit,
+            "max_loss": max_loss,
+        }
@@ -0,0 +1,184 @@
+import numpy as np
+
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import black_scholes_prices
+from models.european.MonteCarlo import monte_carlo_prices
+from models.european.normal import ndtr
+from utils.instrumentation import instrumented
+
+SURFACE_MODELS = ("Black-Scholes", "Binomial", "Monte-Carlo")
+
+@instrumented()
+def price_surface(model, spot_prices, volatilities, K, T, r, N=None, seed=None):
+    """
+    Price calls and puts over a (volatility x spot price) grid in one vectorized evaluation.
+
+    Volatilities run down the rows and spot prices across the columns, matching the
+    heatmap layout, so volatilities[:, None] is broadcast against spot_prices[None, :].
+
+    Parameters:
+    model (str): One of SURFACE_MODELS
+    spot_prices (np.ndarray): Spot prices for the grid columns
+    volatilities (np.ndarray): Volatilities for the grid rows
+    K (float): Strike price
+    T (float): Time to maturity (in years)
+    r (float): Risk-free interest rate
+    N (int): Tree steps (Binomial) or simulated paths (Monte-Carlo)
+    seed (int): Seed for the Monte-Carlo draws
+
+    Returns:
+    tuple: (call_prices, put_prices), each of shape (len(volatilities), len(spot_prices))
+    """
+    S = np.asarray(spot_prices, dtype=float)[None, :]
+    sigma = np.asarray(volatilities, dtype=float)[:, None]
+    if model == "Black-Scholes":
+        return black_scholes_prices(S, K, T, r, sigma)
+    if model == "Binomial":
+        return (binomial_american_batch(S, K, T, r, sigma, N, 'call'),
+                binomial_american_batch(S, K, T, r, sigma, N, 'put'))
+    if model == "Monte-Carlo":
+        return monte_carlo_prices(S, K, T, r, sigma, N, seed)
+    raise ValueError(f"model must be one of {SURFACE_MODELS}, got {model!r}")
+
+def _match_axis(previous, current, decimals):
+    """
+    Locate every value of the current axis on the previous one.
+
+    Returns:
+    np.ndarray: Index into previous for each element of current, -1 where it is new
+    """
+    if len(previous) == 0:
+        return np.full(len(current), -1)
+    previous_keys = np.round(previous, decimals)
+    current_keys = np.round(current, decimals)
+    order = np.argsort(previous_keys, kind="stable")
+    position = np.searchsorted(previous_keys[order], current_keys).clip(max=len(previous) - 1)
+    found = previous_keys[order][position] == current_keys
+    return np.where(found, order[position], -1)
+
+class IncrementalSurface:
+    def __init__(self, decimals=10):
+        """
+        Initialize an incremental evaluator for (volatility x spot price) surfaces.
+
+        Each update is compared with the previous one. Rows and columns whose axis value
+        was already priced under the same model, K, T, r, N and seed are copied; only the
+        new rows and columns are evaluated, so shifting or extending an axis costs in
+        proportion to the cells added. When a scalar input changes every cell is priced
+        again, but Black-Scholes surfaces keep the intermediates the change left valid:
+        log(S/K) per column while K is unchanged, sigma * sqrt(T) per row while T is
+        unchanged, and the discount factor while r and T are unchanged.
+
+        Parameters:
+        decimals (int): Decimals used to match axis values between updates
+        """
+        self.decimals = decimals
+        self.stats = {"cells": 0, "computed": 0, "reused": 0}
+        self._previous = None
+
+    def _black_scholes_block(self, state, rows, columns):
+        """
+        Price the Black-Scholes cells at rows x columns from the cached intermediates.
+        """
+        vol_sqrt_t = state["vol_sqrt_t"][rows, None]
+        log_moneyness = state["log_moneyness"][None, columns]
+        S = state["spot_prices"][None, columns]
+        discounted_strike = state["K"] * state["discount_factor"]
+        d1 = (log_moneyness + state["r"] * state["T"] + 0.5 * vol_sqrt_t**2) / vol_sqrt_t
+        d2 = d1 - vol_sqrt_t
+        call_prices = S * ndtr(d1) - discounted_strike * ndtr(d2)
+        put_prices = discounted_strike * ndtr(-d2) - S * ndtr(-d1)
+        return call_prices, put_prices
+
+    def _price_block(self, state, rows, columns):
+        if state["model"] == "Black-Scholes":
+            return self._black_scholes_block(state, rows, columns)
+        return price_surface(state["model"], state["spot_prices"][columns], state["volatilities"][rows],
+                             state["K"], state["T"], state["r"], state["N"], state["seed"])
+
+    def _intermediates(self, state, previous, row_source, column_source):
+        """
+        Fill in log(S/K), sigma * sqrt(T) and the discount factor, computing only the
+        entries whose inputs changed and copying the rest from the previous update.
+        """
+        reuse_columns = column_source >= 0 if previous is not None and previous["K"] == state["K"] else None
+        reuse_rows = row_source >= 0 if previous is not None and previous["T"] == state["T"] else None
+
+        if reuse_columns is None:
+            state["log_moneyness"] = np.log(state["spot_prices"] / state["K"])
+        else:
+            log_moneyness = np.empty(len(column_source))
+            log_moneyness[reuse_columns] = previous["log_moneyness"][column_source[reuse_columns]]
+            log_moneyness[~reuse_columns] = np.log(state["spot_prices"][~reuse_columns] / state["K"])
+            state["log_moneyness"] = log_moneyness
+
+        if reuse_rows is None:
+            state["vol_sqrt_t"] = state["volatilities"] * np.sqrt(state["T"])
+        else:
+            vol_sqrt_t = np.empty(len(row_source))
+            vol_sqrt_t[reuse_rows] = previous["vol_sqrt_t"][row_source[reuse_rows]]
+            vol_sqrt_t[~reuse_rows] = state["volatilities"][~reuse_rows] * np.sqrt(state["T"])
+            state["vol_sqrt_t"] = vol_sqrt_t
+
+        if reuse_rows is not None and previous["r"] == state["r"]:
+            state["discount_factor"] = previous["discount_factor"]
+        else:
+            state["discount_factor"] = np.exp(-state["r"] * state["T"])
+
+    @instrumented()
+    def update(self, model, spot_prices, volatilities, K, T, r, N=None, seed=None):
+        """
+        Price the surface for new inputs, recomputing only what changed since the last update.
+
+        Takes the same arguments as price_surface. Unseeded Monte-Carlo surfaces are not
+        reproducible, so they are always priced from scratch.
+
+        Returns:
+        tuple: (call_prices, put_prices), read-only arrays of shape (len(volatilities), len(spot_prices))
+        """
+        if model not in SURFACE_MODELS:
+            raise ValueError(f"model must be one of {SURFACE_MODELS}, got {model!r}")
+        state = {
+            "model": model, "K": float(K), "T": float(T), "r": float(r), "N": N, "seed": seed,
+            "spot_prices": np.array(spot_prices, dtype=float),
+            "volatilities": np.array(volatilities, dtype=float),
+        }
+        previous = self._previous
+        shape = (len(state["volatilities"]), len(state["spot_prices"]))
+
+        same_model = previous is not None and previous["model"] == model
+        if same_model:
+            row_source = _match_axis(previous["volatilities"], state["volatilities"], self.decimals)
+            column_source = _match_axis(previous["spot_prices"], state["spot_prices"], self.decimals)
+        else:
+            row_source, column_source = np.full(shape[0], -1), np.full(shape[1], -1)
+        if model == "Black-Scholes":
+            self._intermediates(state, previous if same_model else None, row_source, column_source)
+
+        # Prices themselves can only be copied when every scalar input is unchanged
+        reusable = (same_model and not (model == "Monte-Carlo" and seed is None)
+                    and all(previous[name] == state[name] for name in ("K", "T", "r", "N", "seed")))
+        call_prices, put_prices = np.empty(shape), np.empty(shape)
+        old_rows, old_columns = (row_source >= 0) & reusable, (column_source >= 0) & reusable
+        new_rows, new_columns = np.flatnonzero(~old_rows), np.flatnonzero(~old_columns)
+        old_rows, old_columns = np.flatnonzero(old_rows), np.flatnonzero(old_columns)
+
+        # Cells whose row and column were both priced last time are copied
+        if len(old_rows) and len(old_columns):
+            block = np.ix_(row_source[old_rows], column_source[old_columns])
+            call_prices[np.ix_(old_rows, old_columns)] = previous["call_prices"][block]
+            put_prices[np.ix_(old_rows, old_columns)] = previous["put_prices"][block]
+        # New rows across every column, then new columns for the copied rows
+        for rows, columns in ((new_rows, np.arange(shape[1])), (old_rows, new_columns)):
+            if len(rows) and len(columns):
+                calls, puts = self._price_block(state, rows, columns)
+                call_prices[np.ix_(rows, columns)] = calls
+                put_prices[np.ix_(rows, columns)] = puts
+
+        computed = len(new_rows) * shape[1] + len(old_rows) * len(new_columns)
+        self.stats = {"cells": call_prices.size, "computed": computed, "reused": call_prices.size - computed}
+        call_prices.setflags(write=False)
+        put_prices.setflags(write=False)
+        state["call_prices"], state["put_prices"] = call_prices, put_prices
+        self._previous = state
+        return call_prices, put_prices
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import models.cache
+from models.cache import PricingCache, cached_prices, cached_surface
+
+def test_array_keys_are_digests():
+    cache = PricingCache()
+    grid = np.round(np.linspace(50, 150, 250_000), 4)
+    key = cache.make_key("surface", grid, 100.0)
+    assert all(not isinstance(part, bytes) for part in key)
+    assert key == cache.make_key("surface", grid + 1e-12, 100.0)
+    assert key != cache.make_key("surface", grid[::-1], 100.0)
+    assert key != cache.make_key("surface", grid.reshape(500, 500), 100.0)
+    assert key != cache.make_key("surface", grid.astype(np.float32), 100.0)
+
+def test_lru_evicts_least_recently_used():
+    cache = PricingCache(maxsize=2)
+    for S in (90.0, 100.0, 90.0, 110.0):
+        cached_prices("Black-Scholes", S, 100, 1.0, 0.05, 0.2, cache=cache)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 3, 2)
+    cached_prices("Black-Scholes", 90.0, 100, 1.0, 0.05, 0.2, cache=cache)
+    assert cache.stats()["hits"] == 2
+
+@pytest.fixture
+def priced(monkeypatch):
+    # Counts the calls that actually reach a pricing model
+    calls = []
+    compute_prices, price_surface = models.cache._compute_prices, models.cache.price_surface
+    monkeypatch.setattr(models.cache, "_compute_prices", lambda *args: calls.append(args) or compute_prices(*args))
+    monkeypatch.setattr(models.cache, "price_surface", lambda *args: calls.append(args) or price_surface(*args))
+    return calls
+
+INPUTS = {"S": 100.0, "K": 100.0, "T": 1.0, "r": 0.05, "sigma": 0.2, "N": 50, "seed": 3}
+
+@pytest.mark.parametrize("model", ["Black-Scholes", "Binomial", "Monte-Carlo"])
+def test_repeated_prices_are_returned_from_the_cache(priced, model):
+    cache = PricingCache()
+    first = cached_prices(model, **INPUTS, cache=cache)
+    # Floating point noise below the key's decimals maps to the same entry
+    noisy = dict(INPUTS, S=100.0 + 1e-12, sigma=0.2 - 1e-12)
+    assert cached_prices(model, **noisy, cache=cache) is first
+    assert len(priced) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+@pytest.mark.parametrize("changed", [{"S": 101.0}, {"K": 95.0}, {"T": 0.5}, {"r": 0.02}, {"sigma": 0.3}, {"N": 60}, {"seed": 4}])
+def test_changing_any_input_misses(priced, changed):
+    cache = PricingCache()
+    cached_prices("Monte-Carlo", **INPUTS, cache=cache)
+    cached_prices("Monte-Carlo", **dict(INPUTS, **changed), cache=cache)
+    assert len(priced) == 2
+    assert cache.stats()["hits"] == 0
+
+def test_repeated_surfaces_are_returned_from_the_cache(priced):
+    cache = PricingCache()
+    spots, vols = np.linspace(80, 120, 5), np.linspace(0.1, 0.5, 4)
+    first = cached_surface("Black-Scholes", spots, vols, 100, 1.0, 0.05, cache=cache)
+    assert cached_surface("Black-Scholes", spots + 1e-12, vols.copy(), 100, 1.0, 0.05, cache=cache) is first
+    assert len(priced) == 1
+
+    for args in [(spots + 1, vols, 100, 1.0, 0.05), (spots, vols[:3], 100, 1.0, 0.05), (spots, vols, 105, 1.0, 0.05),
+                 (spots, vols, 100, 0.5, 0.05), (spots, vols, 100, 1.0, 0.02)]:
+        cached_surface("Black-Scholes", *args, cache=cache)
+    cached_surface("Binomial", spots, vols, 100, 1.0, 0.05, 20, cache=cache)
+    assert len(priced) == 7
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from matplot.payoff_plotting import long_call_payoff, long_put_payoff, short_call_payoff, short_put_payoff
+from models.strategy import Leg, Strategy
+
+GRID = np.linspace(50, 150, 10001)
+
+@pytest.mark.parametrize("position, option_type, payoff", [
+    ("long", "call", long_call_payoff),
+    ("short", "call", short_call_payoff),
+    ("long", "put", long_put_payoff),
+    ("short", "put", short_put_payoff),
+])
+def test_single_legs_match_payoff_functions(position, option_type, payoff):
+    strategy = Strategy([Leg(position, option_type, 100, premium=5)])
+    np.testing.assert_allclose(strategy.pnl(GRID), payoff(GRID, 100, 5))
+
+def test_short_put_loss_extends_below_the_grid():
+    summary = Strategy([Leg("short", "put", 100, premium=5)]).summary(GRID)
+    assert summary["max_loss"] == pytest.approx(-95)
+    assert summary["max_profit"] == pytest.approx(5)
+    np.testing.assert_allclose(summary["break_evens"], [95])
+
+def test_short_call_loss_is_unlimited():
+    summary = Strategy([Leg("short", "call", 100, premium=5)]).summary(GRID)
+    assert summary["max_loss"] == -np.inf
+    assert summary["max_profit"] == pytest.approx(5)
+    np.testing.assert_allclose(summary["break_evens"], [105])
+
+def test_long_call_break_even_beyond_the_grid():
+    summary = Strategy([Leg("long", "call", 140, premium=20)]).summary(GRID)
+    assert summary["max_profit"] == np.inf
+    assert summary["max_loss"] == pytest.approx(-20)
+    np.testing.assert_allclose(summary["break_evens"], [160])
+
+def test_bull_call_spread_is_bounded():
+    spread = Strategy([Leg("long", "call", 95, premium=7), Leg("short", "call", 105, premium=3)])
+    summary = spread.summary(GRID)
+    assert summary["max_profit"] == pytest.approx(6)
+    assert summary["max_loss"] == pytest.approx(-4)
+    np.testing.assert_allclose(summary["break_evens"], [99])
+
+def test_bear_put_spread_is_bounded():
+    spread = Strategy([Leg("long", "put", 105, premium=7), Leg("short", "put", 95, premium=3)])
+    summary = spread.summary(np.linspace(98, 102, 41))
+    assert summary["max_profit"] == pytest.approx(6)
+    assert summary["max_loss"] == pytest.approx(-4)
+    np.testing.assert_allclose(summary["break_evens"], [101])
+
+def test_iron_condor():
+    condor = Strategy([Leg("long", "put", 80, premium=1), Leg("short", "put", 90, premium=3),
+                       Leg("short", "call", 110, premium=3), Leg("long", "call", 120, premium=1)])
+    summary = condor.summary(GRID)
+    assert summary["max_profit"] == pytest.approx(4)
+    assert summary["max_loss"] == pytest.approx(-6)
+    np.testing.assert_allclose(summary["break_evens"], [86, 114])
+
+def test_calendar_spread_values_the_back_month():
+    calendar = Strategy([Leg("short", "call", 100, premium=4, expiry=0.25),
+                         Leg("long", "call", 100, premium=6, expiry=0.5)])
+    summary = calendar.summary(GRID, r=0.05, sigma=0.2)
+    # Long the back month: net calls are zero, so both sides are bounded
+    assert np.isfinite(summary["max_profit"]) and np.isfinite(summary["max_loss"])
+    assert summary["pnl"].argmax() == np.abs(GRID - 100).argmin()
+    with pytest.raises(ValueError):
+        calendar.pnl(GRID)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from models.american.Binomial import BinomialAmericanOption
+from models.cache import PricingCache, cached_surface
+from models.european.BlackScholes import BlackScholes
+from models.surface import IncrementalSurface, price_surface
+
+SPOTS = np.linspace(80, 120, 9)
+VOLS = np.linspace(0.1, 0.5, 7)
+
+def assert_matches_full_surface(surface, model, spots, vols, K, T, r, N=None, seed=None):
+    calls, puts = surface.update(model, spots, vols, K, T, r, N, seed)
+    expected_calls, expected_puts = price_surface(model, spots, vols, K, T, r, N, seed)
+    np.testing.assert_allclose(calls, expected_calls, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(puts, expected_puts, rtol=1e-12, atol=1e-12)
+
+@pytest.mark.parametrize("model, N, seed", [("Black-Scholes", None, None), ("Binomial", 20, None), ("Monte-Carlo", 500, 0)])
+def test_updates_match_full_surface(model, N, seed):
+    surface = IncrementalSurface()
+    assert_matches_full_surface(surface, model, SPOTS, VOLS, 100, 1.0, 0.05, N, seed)
+    assert surface.stats["computed"] == SPOTS.size * VOLS.size
+
+    # Shifting the spot axis by one step only prices the new column
+    shifted = SPOTS + (SPOTS[1] - SPOTS[0])
+    assert_matches_full_surface(surface, model, shifted, VOLS, 100, 1.0, 0.05, N, seed)
+    assert surface.stats["computed"] == VOLS.size
+
+    # Extending the volatility axis only prices the new rows
+    extended = np.append(VOLS, [0.6, 0.7])
+    assert_matches_full_surface(surface, model, shifted, extended, 100, 1.0, 0.05, N, seed)
+    assert surface.stats["computed"] == 2 * shifted.size
+
+@pytest.mark.parametrize("K, T, r", [(105, 1.0, 0.05), (100, 0.5, 0.05), (100, 1.0, 0.02)])
+def test_scalar_changes_reprice_every_cell(K, T, r):
+    surface = IncrementalSurface()
+    surface.update("Black-Scholes", SPOTS, VOLS, 100, 1.0, 0.05)
+    assert_matches_full_surface(surface, "Black-Scholes", SPOTS[2:], np.append(VOLS, 0.6), K, T, r)
+    assert surface.stats["computed"] == SPOTS[2:].size * (VOLS.size + 1)
+
+def test_model_change_reprices_every_cell():
+    surface = IncrementalSurface()
+    surface.update("Black-Scholes", SPOTS, VOLS, 100, 1.0, 0.05)
+    assert_matches_full_surface(surface, "Binomial", SPOTS, VOLS, 100, 1.0, 0.05, 20)
+    assert surface.stats["computed"] == SPOTS.size * VOLS.size
+
+def test_cached_surface_prices_misses_incrementally():
+    cache, surface = PricingCache(), IncrementalSurface()
+    first = cached_surface("Black-Scholes", SPOTS, VOLS, 100, 1.0, 0.05, cache=cache, incremental=surface)
+    cached_surface("Black-Scholes", SPOTS + 5, VOLS, 100, 1.0, 0.05, cache=cache, incremental=surface)
+    assert surface.stats["computed"] == VOLS.size
+
+    # Returning to earlier inputs is an LRU hit and leaves the incremental state alone
+    again = cached_surface("Black-Scholes", SPOTS, VOLS, 100, 1.0, 0.05, cache=cache, incremental=surface)
+    assert again is first
+    assert cache.stats()["hits"] == 1
+    assert surface.stats["computed"] == VOLS.size
+
+@pytest.mark.parametrize("model, N", [("Black-Scholes", None), ("Binomial", 30)])
+def test_vectorized_surface_matches_per_cell_pricing(model, N):
+    calls, puts = price_surface(model, SPOTS, VOLS, 100, 1.0, 0.05, N)
+    assert calls.shape == puts.shape == (VOLS.size, SPOTS.size)
+    for i, sigma in enumerate(VOLS):
+        for j, S in enumerate(SPOTS):
+            if model == "Black-Scholes":
+                expected = BlackScholes(S, 100, 1.0, 0.05, sigma).prices()
+            else:
+                option = BinomialAmericanOption(S, 100, 1.0, 0.05, sigma, N, fast=False)
+                expected = option.call_price(), option.put_price()
+            assert (calls[i, j], puts[i, j]) == pytest.approx(expected, rel=1e-10)
+
+def test_monte_carlo_surface_is_seeded():
+    first = price_surface("Monte-Carlo", SPOTS, VOLS, 100, 1.0, 0.05, 2_000, seed=7)
+    second = price_surface("Monte-Carlo", SPOTS, VOLS, 100, 1.0, 0.05, 2_000, seed=7)
+    np.testing.assert_array_equal(first[0], second[0])
+    with pytest.raises(ValueError):
+        price_surface("Heston", SPOTS, VOLS, 100, 1.0, 0.05)
@@ -0,0 +1,377 @@
+"""
+Serve option prices over HTTP/JSON on localhost, batching concurrent requests.
+
+Usage (from the project root):
+    python pricing_service.py --port 8765 --window-ms 5 --workers 4
+
+POST /price with one contract, or a list of them:
+    {"model": "Binomial", "S": 100, "K": 100, "T": 1, "r": 0.05, "sigma": 0.2, "N": 200}
+and get back {"call": ..., "put": ...} (or a list). model is "Black-Scholes" (the
+default), "Binomial" (N tree steps, default 100) or "Monte-Carlo" (N paths, default
+10000, optional integer seed, default 0).
+
+Requests that arrive within --window-ms of each other are priced together in one
+vectorized call per model, so a burst of single-contract requests costs about the same
+as one chain. Binomial and Monte-Carlo batches run in a process pool; Black-Scholes
+batches are cheap enough to price on the event loop. GET /metrics returns request
+latency and batch size statistics per model. The server only binds to loopback.
+
+Requests are bounded: bodies over --max-body-bytes and lists of more than
+--max-contracts get 413, and N above MAX_STEPS gets 400. If a worker process dies the
+pool is rebuilt and the affected batch is retried once.
+"""
+import argparse
+import asyncio
+import bisect
+import concurrent.futures
+import concurrent.futures.process
+import json
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import black_scholes_prices
+from models.european.MonteCarlo import monte_carlo_prices
+from models.surface import SURFACE_MODELS
+from utils.instrumentation import SectionStats
+
+LOCALHOST = ("127.0.0.1", "localhost", "::1")
+CONTRACT_FIELDS = ("S", "K", "T", "r", "sigma")
+DEFAULT_STEPS = {"Binomial": 100, "Monte-Carlo": 10000}
+# Largest tree / path count a single contract may ask for
+MAX_STEPS = {"Binomial": 10_000, "Monte-Carlo": 1_000_000}
+# Header lines accepted per request
+MAX_HEADERS = 100
+# Models whose batches are sent to the process pool instead of running on the event loop
+PROCESS_POOL_MODELS = ("Binomial", "Monte-Carlo")
+# Upper edges of the batch size histogram buckets (last bucket is open)
+BATCH_SIZE_EDGES = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+class PayloadTooLarge(ValueError):
+    """A request body or contract list exceeds the service limits."""
+
+def _price_batch(model, S, K, T, r, sigma, N, seed):
+    """
+    Price one micro-batch of contracts; runs in a worker process for the heavy models.
+
+    Returns:
+    tuple: (call_prices, put_prices) as lists
+    """
+    if model == "Black-Scholes":
+        calls, puts = black_scholes_prices(S, K, T, r, sigma)
+    elif model == "Binomial":
+        calls = binomial_american_batch(S, K, T, r, sigma, N, 'call')
+        puts = binomial_american_batch(S, K, T, r, sigma, N, 'put')
+    else:
+        # Common random numbers need one path count and seed per call
+        calls, puts = np.empty(len(S)), np.empty(len(S))
+        for n, s in set(zip(N.tolist(), seed.tolist())):
+            rows = (N == n) & (seed == s)
+            calls[rows], puts[rows] = monte_carlo_prices(S[rows], K[rows], T[rows], r[rows], sigma[rows], n, s)
+    return calls.tolist(), puts.tolist()
+
+def _parse_contract(payload):
+    """
+    Validate one contract from a request body.
+
+    Returns:
+    tuple: (model, (S, K, T, r, sigma, N, seed))
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("each contract must be a JSON object")
+    model = payload.get("model", "Black-Scholes")
+    if model not in SURFACE_MODELS:
+        raise ValueError(f"model must be one of {SURFACE_MODELS}, got {model!r}")
+    missing = [field for field in CONTRACT_FIELDS if field not in payload]
+    if missing:
+        raise ValueError(f"contract is missing {', '.join(missing)}")
+    values = [float(payload[field]) for field in CONTRACT_FIELDS]
+    if values[0] <= 0 or values[1] <= 0 or values[2] <= 0 or values[4] <= 0:
+        raise ValueError("S, K, T and sigma must be positive")
+    N = int(payload.get("N", DEFAULT_STEPS.get(model, 0)))
+    if model != "Black-Scholes" and not 1 <= N <= MAX_STEPS[model]:
+        raise ValueError(f"N must be an integer between 1 and {MAX_STEPS[model]} for {model}")
+    return model, (*values, N, int(payload.get("seed", 0)))
+
+class MicroBatcher:
+    def __init__(self, model, executor, window, max_batch, replace_executor=None):
+        """
+        Initialize a coalescing queue of contracts for one model.
+
+        The first contract to arrive opens a window; every contract submitted before it
+        closes (or until max_batch are waiting) is priced in the same call.
+
+        Parameters:
+        model (str): One of SURFACE_MODELS
+        executor (concurrent.futures.Executor): Where batches run, or None for the event loop
+        window (float): Seconds to wait for more contracts after the first one
+        max_batch (int): Contracts that trigger an immediate flush
+        replace_executor (callable): Called with a broken process pool, returns the one to retry on
+        """
+        self.model = model
+        self.executor = executor
+        self.replace_executor = replace_executor
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = SectionStats(f"{model}.batch")
+        self.batch_sizes = [0] * (len(BATCH_SIZE_EDGES) + 1)
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    def submit(self, contract):
+        """
+        Queue a contract and return a future resolving to its (call, put) prices.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((contract, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        columns = zip(*(contract for contract, _ in batch))
+        S, K, T, r, sigma, N, seed = (np.array(column) for column in columns)
+        start = time.perf_counter_ns()
+        try:
+            if self.executor is None:
+                calls, puts = _price_batch(self.model, S, K, T, r, sigma, N, seed)
+            else:
+                calls, puts = await self._run_in_executor(S, K, T, r, sigma, N, seed)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches.record(time.perf_counter_ns() - start, len(batch))
+        self.batch_sizes[bisect.bisect_left(BATCH_SIZE_EDGES, len(batch))] += 1
+        for (_, future), call, put in zip(batch, calls, puts):
+            if not future.done():
+                future.set_result((call, put))
+
+    async def _run_in_executor(self, *columns):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, _price_batch, self.model, *columns)
+            except concurrent.futures.process.BrokenProcessPool:
+                # A worker died (killed, out of memory...): price on a fresh pool, once
+                if self.replace_executor is None:
+                    raise
+                self.replace_executor(executor)
+                if attempt:
+                    raise
+
+    def metrics(self):
+        labels = [f"<={edge}" for edge in BATCH_SIZE_EDGES] + [f">{BATCH_SIZE_EDGES[-1]}"]
+        batches = self.batches.as_dict()
+        return {
+            "batches": batches["calls"],
+            "contracts": batches["array_elements"],
+            "mean_batch_size": batches["array_elements"] / batches["calls"] if batches["calls"] else 0.0,
+            "max_batch_size": batches["max_array_elements"],
+            "batch_size_histogram": dict(zip(labels, self.batch_sizes)),
+            "batch_ms": {key: batches[key] for key in ("mean_ms", "min_ms", "max_ms", "histogram_us")},
+        }
+
+class PricingService:
+    def __init__(self, host="127.0.0.1", port=8765, window_ms=5.0, max_batch=4096, workers=None,
+                 max_body_bytes=1 << 20, max_contracts=10_000):
+        """
+        Initialize the pricing service.
+
+        Parameters:
+        host (str): Loopback address to bind; anything else is refused
+        port (int): TCP port (0 picks a free one)
+        window_ms (float): Coalescing window for micro-batches, in milliseconds
+        max_batch (int): Contracts that flush a micro-batch immediately
+        workers (int): Size of the process pool for the heavy models (defaults to the number of CPUs)
+        max_body_bytes (int): Largest request body accepted
+        max_contracts (int): Most contracts accepted in one request
+        """
+        if host not in LOCALHOST:
+            raise ValueError(f"the pricing service only binds to localhost, got {host!r}")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_body_bytes = max_body_bytes
+        self.max_contracts = max_contracts
+        self.executor = self._new_executor()
+        self.batchers = {
+            model: MicroBatcher(model, self.executor if model in PROCESS_POOL_MODELS else None, window_ms / 1e3, max_batch,
+                                replace_executor=self._replace_executor)
+            for model in SURFACE_MODELS
+        }
+        self.latency = {model: SectionStats(f"{model}.request") for model in SURFACE_MODELS}
+        self.errors = 0
+        self.pool_restarts = 0
+        self.started = time.time()
+        self._server = None
+
+    def _new_executor(self):
+        # Workers are started on demand from a process that already runs executor threads,
+        # where forking can deadlock, so they are spawned fresh instead
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _replace_executor(self, broken):
+        # Several batches can hit the same broken pool; only the first one replaces it
+        if broken is self.executor:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new_executor()
+            self.pool_restarts += 1
+            for model in PROCESS_POOL_MODELS:
+                self.batchers[model].executor = self.executor
+        return self.executor
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def price(self, payload):
+        """
+        Price one contract or a list of them through the micro-batchers.
+
+        Returns:
+        dict or list: {"call": ..., "put": ...} per contract
+        """
+        if isinstance(payload, list) and len(payload) > self.max_contracts:
+            raise PayloadTooLarge(f"at most {self.max_contracts} contracts per request, got {len(payload)}")
+        contracts = [_parse_contract(item) for item in (payload if isinstance(payload, list) else [payload])]
+        start = time.perf_counter_ns()
+        results = await asyncio.gather(*(self.batchers[model].submit(contract) for model, contract in contracts))
+        elapsed = time.perf_counter_ns() - start
+        for model in {model for model, _ in contracts}:
+            self.latency[model].record(elapsed, sum(1 for m, _ in contracts if m == model))
+        priced = [{"call": call, "put": put} for call, put in results]
+        return priced if isinstance(payload, list) else priced[0]
+
+    def metrics(self):
+        models = {}
+        for model in SURFACE_MODELS:
+            latency = self.latency[model].as_dict()
+            models[model] = {
+                "requests": latency["calls"],
+                "latency_ms": {key: latency[key] for key in ("mean_ms", "min_ms", "max_ms", "histogram_us")},
+                **self.batchers[model].metrics(),
+            }
+        return {"uptime_s": time.time() - self.started, "errors": self.errors, "pool_restarts": self.pool_restarts,
+                "models": models}
+
+    async def _route(self, method, path, body):
+        if path == "/metrics":
+            return (200, self.metrics()) if method == "GET" else (405, {"error": "use GET"})
+        if path == "/price":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                return 200, await self.price(json.loads(body or b"null"))
+            except PayloadTooLarge as e:
+                self.errors += 1
+                return 413, {"error": str(e)}
+            except (ValueError, TypeError) as e:
+                self.errors += 1
+                return 400, {"error": str(e)}
+        return 404, {"error": f"no route for {path}"}
+
+    async def _handle_connection(self, reader, writer):
+        # Minimal HTTP/1.1: one JSON request per round trip, connections kept alive
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                keep_alive = True
+                try:
+                    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        if len(headers) >= MAX_HEADERS:
+                            raise ValueError("too many headers")
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                    if length > self.max_body_bytes:
+                        raise PayloadTooLarge(f"request body over {self.max_body_bytes} bytes")
+                    body = await reader.readexactly(length)
+                    status, payload = await self._route(method, path, body)
+                except PayloadTooLarge as e:
+                    # The body is left unread, so the connection cannot be reused
+                    self.errors += 1
+                    status, payload, keep_alive = 413, {"error": str(e)}, False
+                except ValueError:
+                    # The stream position is unknown after a malformed request, so drop the connection
+                    status, payload, keep_alive = 400, {"error": "malformed HTTP request"}, False
+                except Exception as e:
+                    self.errors += 1
+                    status, payload = 500, {"error": str(e)}
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def _serve(args):
+    service = await PricingService(args.host, args.port, args.window_ms, args.max_batch, args.workers,
+                                   args.max_body_bytes, args.max_contracts).start()
+    print(f"Pricing service listening on http://{service.host}:{service.port}")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", choices=LOCALHOST, help="loopback address to bind")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default 8765)")
+    parser.add_argument("--window-ms", type=float, default=5.0, help="coalescing window in milliseconds (default 5)")
+    parser.add_argument("--max-batch", type=int, default=4096, help="contracts that flush a batch immediately")
+    parser.add_argument("--workers", type=int, help="process pool size for Binomial and Monte-Carlo (default: CPUs)")
+    parser.add_argument("--max-body-bytes", type=int, default=1 << 20, help="largest request body accepted (default 1 MiB)")
+    parser.add_argument("--max-contracts", type=int, default=10_000, help="most contracts per request (default 10000)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_pricer import GREEK_COLUMNS, main, price_chunk, run
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import black_scholes_greeks, black_scholes_prices
+
+def contracts(rows=30):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "StockPrice": rng.uniform(80, 120, rows),
+        "StrikePrice": rng.uniform(80, 120, rows),
+        "TimeToExpiry": rng.uniform(0.1, 2, rows),
+        "InterestRate": rng.uniform(0, 0.08, rows),
+        "Volatility": rng.uniform(0.1, 0.5, rows),
+        "Model": np.resize(["Black-Scholes", "Binomial", "Monte-Carlo"], rows),
+    })
+
+def test_rows_are_priced_by_their_model():
+    df = contracts()
+    priced = price_chunk(df, steps=50, simulations=20_000)
+    S, K, T, r, sigma = (df[column].to_numpy() for column in ("StockPrice", "StrikePrice", "TimeToExpiry", "InterestRate", "Volatility"))
+
+    rows = (df["Model"] == "Black-Scholes").to_numpy()
+    calls, puts = black_scholes_prices(S[rows], K[rows], T[rows], r[rows], sigma[rows])
+    np.testing.assert_allclose(priced["CallPrice"][rows], calls)
+    np.testing.assert_allclose(priced["Vega"][rows], black_scholes_greeks(S[rows], K[rows], T[rows], r[rows], sigma[rows])["vega"])
+
+    rows = (df["Model"] == "Binomial").to_numpy()
+    np.testing.assert_allclose(priced["PutPrice"][rows], binomial_american_batch(S[rows], K[rows], T[rows], r[rows], sigma[rows], 50, 'put'))
+    assert priced["Vega"][rows].isna().all()
+
+    rows = (df["Model"] == "Monte-Carlo").to_numpy()
+    calls, puts = black_scholes_prices(S[rows], K[rows], T[rows], r[rows], sigma[rows])
+    np.testing.assert_allclose(priced["CallPrice"][rows], calls, atol=0.5)
+    np.testing.assert_allclose(priced["CallDelta"][rows], black_scholes_greeks(S[rows], K[rows], T[rows], r[rows], sigma[rows])["call_delta"], atol=0.05)
+    assert not priced[list(GREEK_COLUMNS)[:3]].isna().any().any()
+
+def test_bad_input_is_rejected():
+    with pytest.raises(ValueError, match="missing required columns"):
+        price_chunk(contracts().drop(columns="Volatility"))
+    with pytest.raises(ValueError, match="Model must be one of"):
+        price_chunk(contracts().assign(Model="Heston"))
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_csv_round_trip_in_chunks(tmp_path, workers):
+    df = contracts(25)
+    df.to_csv(tmp_path / "in.csv", index=False)
+    rows, _ = run(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), chunk_size=4, workers=workers, steps=20, simulations=2_000)
+    out = pd.read_csv(tmp_path / "out.csv")
+    assert rows == len(out) == 25
+    pd.testing.assert_frame_equal(out, price_chunk(df, steps=20, simulations=2_000), check_exact=False, rtol=1e-9)
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = contracts(12)
+    df.to_parquet(tmp_path / "in.parquet", index=False)
+    assert main([str(tmp_path / "in.parquet"), str(tmp_path / "out.parquet"), "--chunk-size", "5", "--steps", "20"]) == 0
+    out = pd.read_parquet(tmp_path / "out.parquet")
+    assert len(out) == 12
+    np.testing.assert_allclose(out["CallPrice"], price_chunk(df, steps=20)["CallPrice"])
+
+def test_cli_rejects_unknown_formats(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "in.txt"), str(tmp_path / "out.csv")])
+    assert "unsupported file type" in capsys.readouterr().err
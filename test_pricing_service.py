@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from models.american.Binomial import binomial_american_batch
+from models.european.BlackScholes import black_scholes_prices
+from pricing_service import MAX_STEPS, PricingService
+
+CONTRACT = {"S": 100, "K": 100, "T": 1, "r": 0.05, "sigma": 0.2}
+
+async def request(port, method, path, body=None, headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    head = {"Content-Length": str(len(data)), "Connection": "close", **(headers or {})}
+    writer.write(f"{method} {path} HTTP/1.1\r\n".encode()
+                 + "".join(f"{name}: {value}\r\n" for name, value in head.items()).encode() + b"\r\n" + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.partition(b"\r\n\r\n")[2])
+
+def run_service(test, **options):
+    async def main():
+        service = await PricingService(port=0, workers=1, **options).start()
+        try:
+            return await test(service)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+def test_prices_match_the_models():
+    async def test(service):
+        single = request(service.port, "POST", "/price", CONTRACT)
+        chain = request(service.port, "POST", "/price", [{**CONTRACT, "K": K, "model": "Binomial", "N": 50} for K in (90, 110)])
+        return await asyncio.gather(single, chain)
+
+    (status, single), (chain_status, chain) = run_service(test)
+    assert status == chain_status == 200
+    call, put = black_scholes_prices(100, 100, 1, 0.05, 0.2)
+    assert single == pytest.approx({"call": call, "put": put})
+    puts = binomial_american_batch(np.full(2, 100.0), np.array([90.0, 110.0]), 1, 0.05, 0.2, 50, 'put')
+    assert [priced["put"] for priced in chain] == pytest.approx(puts.tolist())
+
+def test_rejects_bad_and_oversized_requests():
+    async def test(service):
+        return [
+            await request(service.port, "POST", "/price", {**CONTRACT, "sigma": -1}),
+            await request(service.port, "POST", "/price", {**CONTRACT, "model": "Binomial", "N": MAX_STEPS["Binomial"] + 1}),
+            await request(service.port, "POST", "/price", [CONTRACT] * 3),
+            await request(service.port, "POST", "/price", b"x" * 2048),
+            await request(service.port, "GET", "/price"),
+            await request(service.port, "GET", "/missing"),
+        ]
+
+    statuses = [status for status, _ in run_service(test, max_contracts=2, max_body_bytes=1024)]
+    assert statuses == [400, 400, 413, 413, 405, 404]
+
+def test_rebuilds_a_broken_process_pool():
+    async def test(service):
+        binomial = {**CONTRACT, "model": "Binomial", "N": 20}
+        status, first = await request(service.port, "POST", "/price", binomial)
+        for pid in list(service.executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.5)
+        status_after, second = await request(service.port, "POST", "/price", binomial)
+        _, metrics = await request(service.port, "GET", "/metrics")
+        return status, first, status_after, second, metrics
+
+    status, first, status_after, second, metrics = run_service(test)
+    assert status == status_after == 200
+    assert second == pytest.approx(first)
+    assert metrics["pool_restarts"] == 1
+    assert metrics["models"]["Binomial"]["requests"] == 2
@@ -0,0 +1,101 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+class LRUCache:
+    def __init__(self, maxsize=256, decimals=8):
+        """
+        Initialize a bounded LRU cache for results computed from numeric inputs.
+
+        Keys are built from a name, an optional seed and the inputs rounded to a fixed
+        number of decimals, so inputs that differ only by floating point noise share an
+        entry. Array inputs are keyed by their shape, dtype and a digest of the rounded
+        values. Cached arrays are made read-only so callers cannot corrupt them.
+
+        Parameters:
+        maxsize (int): Maximum number of cached results before the least recently used is evicted
+        decimals (int): Decimals kept when quantizing float inputs for the key
+        """
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _quantize(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        array = np.asarray(value)
+        if array.ndim == 0:
+            return round(float(array), self.decimals)
+        # Arrays are keyed by a digest so large grids do not keep a copy of their bytes alive
+        rounded = np.ascontiguousarray(np.round(array.astype(float), self.decimals))
+        return (array.shape, array.dtype.str, hashlib.blake2b(rounded.tobytes(), digest_size=16).hexdigest())
+
+    def make_key(self, model, *inputs, seed=None):
+        """
+        Build the cache key for a model (or plot) name, its inputs and its seed.
+
+        Returns:
+        tuple: A hashable key
+        """
+        return (model, seed) + tuple(self._quantize(value) for value in inputs)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached result for key, computing and storing it on a miss.
+
+        Parameters:
+        key (tuple): Key from make_key
+        compute (callable): Zero-argument function producing the result
+
+        Returns:
+        The cached or freshly computed result
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute()
+        if isinstance(result, tuple):
+            for value in result:
+                if isinstance(value, np.ndarray):
+                    value.setflags(write=False)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def stats(self):
+        """
+        Report hit/miss statistics for the cache.
+
+        Returns:
+        dict: hits, misses, evictions, hit_rate, size and maxsize
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
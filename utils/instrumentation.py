@@ -0,0 +1,213 @@
+"""
+Opt-in timers and counters for the pricing models and plotting functions.
+
+Instrumentation is off by default; every decorated call then costs a single lookup.
+Turn it on for the whole process with enable() (or OPTION_PRICING_INSTRUMENTATION=1),
+or for the current thread / async context only with activate(collector), to collect
+per section call counts, latency histograms and input array sizes, which can be read
+with snapshot() or exported as JSON lines. The Streamlit app activates one Collector
+per browser session, so one user's debug switch neither turns timing on for the
+others nor mixes their numbers.
+"""
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Upper edges of the latency histogram buckets, in microseconds (last bucket is open)
+HISTOGRAM_EDGES_US = (10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+
+logger = logging.getLogger("option_pricing.instrumentation")
+
+_enabled = os.environ.get("OPTION_PRICING_INSTRUMENTATION") == "1"
+
+class SectionStats:
+    def __init__(self, name):
+        """
+        Initialize the counters of one instrumented section.
+
+        Parameters:
+        name (str): Section name
+        """
+        self.name = name
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.histogram = [0] * (len(HISTOGRAM_EDGES_US) + 1)
+        self.array_elements = 0
+        self.max_array_elements = 0
+
+    def record(self, elapsed_ns, array_elements):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.min_ns = elapsed_ns if self.min_ns is None else min(self.min_ns, elapsed_ns)
+        self.max_ns = max(self.max_ns, elapsed_ns)
+        self.histogram[bisect.bisect_left(HISTOGRAM_EDGES_US, elapsed_ns / 1e3)] += 1
+        self.array_elements += array_elements
+        self.max_array_elements = max(self.max_array_elements, array_elements)
+
+    def as_dict(self):
+        return {
+            "section": self.name,
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.calls / 1e6 if self.calls else 0.0,
+            "min_ms": (self.min_ns or 0) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "histogram_us": dict(zip([f"<={edge}" for edge in HISTOGRAM_EDGES_US] + [f">{HISTOGRAM_EDGES_US[-1]}"], self.histogram)),
+            "array_elements": self.array_elements,
+            "max_array_elements": self.max_array_elements,
+        }
+
+class Collector:
+    def __init__(self):
+        """
+        Initialize an empty set of section statistics.
+        """
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def record(self, section, elapsed_ns, array_elements=0):
+        with self._lock:
+            stats = self._sections.get(section)
+            if stats is None:
+                stats = self._sections[section] = SectionStats(section)
+            stats.record(elapsed_ns, array_elements)
+
+    def snapshot(self):
+        with self._lock:
+            stats = [section.as_dict() for section in self._sections.values()]
+        return sorted(stats, key=lambda section: section["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._sections.clear()
+
+# Collects for the whole process while enable()d
+_process_collector = Collector()
+# Collector activated for the current thread / async context, if any
+_active = contextvars.ContextVar("instrumentation_collector", default=None)
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def activate(collector):
+    """
+    Record into collector for the rest of the current thread or async context.
+
+    Parameters:
+    collector (Collector): Where to record, or None to fall back to the process-wide setting
+
+    Returns:
+    contextvars.Token: Token to pass to ContextVar.reset, for callers that restore the previous state
+    """
+    return _active.set(collector)
+
+def current_collector():
+    """
+    Return the collector calls are recorded into: the activated one, else the process-wide
+    one when enabled, else None.
+    """
+    collector = _active.get()
+    if collector is None and _enabled:
+        return _process_collector
+    return collector
+
+def is_enabled():
+    return current_collector() is not None
+
+def _array_elements(args, kwargs):
+    # Size of the NumPy inputs, so latency can be read against problem size
+    return sum(value.size for value in (*args, *kwargs.values()) if isinstance(value, np.ndarray))
+
+def record(section, elapsed_ns, array_elements=0):
+    (current_collector() or _process_collector).record(section, elapsed_ns, array_elements)
+
+def instrumented(section=None):
+    """
+    Decorate a function so its calls are timed and counted while instrumentation is enabled.
+
+    Parameters:
+    section (str): Section name (defaults to module.qualname of the function)
+
+    Returns:
+    callable: The decorator
+    """
+    def decorator(fn):
+        name = section or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            collector = current_collector()
+            if collector is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                collector.record(name, time.perf_counter_ns() - start, _array_elements(args, kwargs))
+        return wrapper
+    return decorator
+
+@contextmanager
+def timed(section, array_elements=0):
+    """
+    Time a block of code as one call of section while instrumentation is enabled.
+
+    Parameters:
+    section (str): Section name
+    array_elements (int): Size of the data processed by the block
+    """
+    collector = current_collector()
+    if collector is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        collector.record(section, time.perf_counter_ns() - start, array_elements)
+
+def snapshot():
+    """
+    Return the statistics of every section of the current collector, slowest total first.
+
+    Returns:
+    list: One dict per section
+    """
+    return (current_collector() or _process_collector).snapshot()
+
+def reset():
+    (current_collector() or _process_collector).reset()
+
+def export_jsonl(stream=None):
+    """
+    Export the statistics as structured JSON lines.
+
+    Parameters:
+    stream (file): Where to write the lines; when omitted they go to the
+                   'option_pricing.instrumentation' logger at INFO level
+
+    Returns:
+    str: The exported JSON lines
+    """
+    lines = [json.dumps({"timestamp": time.time(), **section}) for section in snapshot()]
+    for line in lines:
+        if stream is None:
+            logger.info(line)
+        else:
+            stream.write(line + "\n")
+    return "\n".join(lines)
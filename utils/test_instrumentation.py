@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+
+from utils import instrumentation
+
+@instrumentation.instrumented("test.square")
+def square(x):
+    return x * x
+
+def run_in_thread(fn):
+    thread = threading.Thread(target=fn)
+    thread.start()
+    thread.join()
+
+def test_disabled_records_nothing():
+    instrumentation.disable()
+    instrumentation.reset()
+    collector = instrumentation.Collector()
+    instrumentation.activate(collector)
+    square(np.ones(3))
+    assert collector.snapshot()[0]["calls"] == 1
+
+    # Deactivated with instrumentation disabled: neither the old collector nor the
+    # process-wide one sees the calls
+    instrumentation.activate(None)
+    assert not instrumentation.is_enabled()
+    square(np.ones(3))
+    run_in_thread(lambda: square(np.ones(3)))
+    assert collector.snapshot()[0]["calls"] == 1
+    assert instrumentation.snapshot() == []
+
+def test_activated_collector_is_local_to_its_thread():
+    first, second = instrumentation.Collector(), instrumentation.Collector()
+
+    def session(collector, calls):
+        instrumentation.activate(collector)
+        for _ in range(calls):
+            square(np.ones(4))
+        with instrumentation.timed("test.block", 10):
+            pass
+
+    run_in_thread(lambda: session(first, 2))
+    run_in_thread(lambda: session(second, 3))
+    run_in_thread(lambda: square(np.ones(4)))
+
+    stats = {section["section"]: section for section in first.snapshot()}
+    assert stats["test.square"]["calls"] == 2
+    assert stats["test.square"]["array_elements"] == 8
+    assert stats["test.block"]["max_array_elements"] == 10
+    assert {section["section"]: section["calls"] for section in second.snapshot()}["test.square"] == 3
+    # The calling thread never activated a collector
+    assert not instrumentation.is_enabled()
+
+def test_enable_collects_process_wide():
+    instrumentation.enable()
+    try:
+        instrumentation.reset()
+        square(2.0)
+        run_in_thread(lambda: square(3.0))
+        assert instrumentation.snapshot()[0]["calls"] == 2
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()